@@ -153,11 +153,9 @@ def demo_file_processing(sample_file: str):
     
     logger.info(f"🎵 Processing sample file: {sample_file}")
     
-    # Initialize pipeline
-    pipeline = create_processing_pipeline()
-    
-    # Process the file
-    result = pipeline.process_file(sample_file)
+    # Initialize pipeline and process the file
+    with create_processing_pipeline() as pipeline:
+        result = pipeline.process_file(sample_file)
     
     if result.success:
         logger.info("✅ Processing completed successfully!")
@@ -72,10 +72,10 @@ def smoke_test_audio_processing(audio_file: str, result: SmokeTestResult) -> boo
     logger.info(f"🎵 Testing audio processing: {Path(audio_file).name}")
     
     try:
-        pipeline = create_processing_pipeline()
         start_time = time.time()
         
-        processing_result = pipeline.process_file(audio_file)
+        with create_processing_pipeline() as pipeline:
+            processing_result = pipeline.process_file(audio_file)
         
         processing_time = time.time() - start_time
         result.performance_metrics[f"audio_{Path(audio_file).stem}"] = processing_time
@@ -139,10 +139,10 @@ def smoke_test_midi_processing(midi_file: str, result: SmokeTestResult) -> bool:
     logger.info(f"🎹 Testing MIDI processing: {Path(midi_file).name}")
     
     try:
-        pipeline = create_processing_pipeline()
         start_time = time.time()
         
-        processing_result = pipeline.process_file(midi_file)
+        with create_processing_pipeline() as pipeline:
+            processing_result = pipeline.process_file(midi_file)
         
         processing_time = time.time() - start_time
         result.performance_metrics[f"midi_{Path(midi_file).stem}"] = processing_time
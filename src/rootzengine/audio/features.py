@@ -1,9 +1,11 @@
 """Audio feature extraction functionality"""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import numpy as np
+import audioread.exceptions
 import librosa
 import librosa.feature
+import soundfile as sf
 from pathlib import Path
 import logging
 
@@ -12,6 +14,16 @@ from ..core.exceptions import AudioProcessingError
 
 logger = logging.getLogger(__name__)
 
+# Errors librosa/soundfile raise for unreadable or unsuitable audio; librosa's
+# audioread fallback raises DecodeError (NoBackendError subclasses it)
+_DECODE_ERRORS = (
+    OSError,
+    RuntimeError,
+    ValueError,
+    librosa.ParameterError,
+    audioread.exceptions.DecodeError,
+)
+
 
 def extract_audio_features(audio_file_path: str) -> Dict[str, Any]:
     """
@@ -37,55 +49,91 @@ class FeatureExtractor:
     
     def __init__(self, config: Optional[AudioConfig] = None):
         self.config = config or AudioConfig()
+    
+    def _check_audio_file(self, audio_path: str) -> None:
+        """Fail fast on a missing path instead of inside librosa."""
+        if not Path(audio_path).is_file():
+            raise AudioProcessingError(f"Audio file not found: {audio_path}")
+    
+    def _load_sample_rate(self, audio_path: str) -> Optional[int]:
+        """Get the sample rate to request from librosa.load.
+        
+        Returns None when the file is already at the configured rate so
+        librosa skips its resampling pass.
+        """
+        try:
+            native_sr = sf.info(audio_path).samplerate
+        except RuntimeError:
+            # libsndfile can't probe this file; let librosa resample as usual
+            return self.config.sample_rate
         
+        return None if native_sr == self.config.sample_rate else self.config.sample_rate
+        
+    def load_audio(self, audio_path: str) -> Tuple[np.ndarray, int]:
+        """Decode an audio file to mono float32 at the configured sample rate.
+        
+        Callers that need both features and the samples can decode once and
+        pass the result to extract_all_features_from_array.
+        """
+        self._check_audio_file(audio_path)
+        return librosa.load(
+            audio_path, sr=self._load_sample_rate(audio_path), dtype=np.float32
+        )
+    
     def extract_all_features(self, audio_path: str) -> Dict:
         """Extract comprehensive feature set from audio file."""
         try:
-            y, sr = librosa.load(audio_path, sr=self.config.sample_rate)
+            y, sr = self.load_audio(audio_path)
+            S = self._magnitude_spectrogram(y)
             
             features = {
-                "spectral": self._extract_spectral_features(y, sr),
+                "spectral": self._extract_spectral_features(y, sr, S),
                 "rhythm": self._extract_rhythm_features(y, sr),
                 "harmonic": self._extract_harmonic_features(y, sr),
-                "energy": self._extract_energy_features(y, sr),
+                "energy": self._extract_energy_features(y, sr, S),
                 "temporal": self._extract_temporal_features(y, sr),
             }
             
             logger.info(f"Extracted features from {audio_path}")
             return features
             
-        except Exception as e:
+        except _DECODE_ERRORS as e:
             raise AudioProcessingError(f"Feature extraction failed: {str(e)}")
     
-    def _extract_spectral_features(self, y: np.ndarray, sr: int) -> Dict:
-        """Extract spectral features (MFCC, chroma, spectral characteristics)."""
+    def _magnitude_spectrogram(self, y: np.ndarray) -> np.ndarray:
+        """Compute the STFT magnitude shared by the spectral and energy features."""
+        return np.abs(librosa.stft(y, hop_length=self.config.hop_length))
+    
+    def _extract_spectral_features(
+        self, y: np.ndarray, sr: int, S: Optional[np.ndarray] = None
+    ) -> Dict:
+        """Extract spectral features (MFCC, chroma, spectral characteristics).
+        
+        S is the magnitude spectrogram of y; passing it in saves every
+        feature below from running its own STFT.
+        """
+        if S is None:
+            S = self._magnitude_spectrogram(y)
+        power = S ** 2
         
         # MFCC features
         mfcc = librosa.feature.mfcc(
-            y=y, sr=sr, 
-            n_mfcc=self.config.n_mfcc,
-            hop_length=self.config.hop_length
+            S=librosa.power_to_db(librosa.feature.melspectrogram(S=power, sr=sr)),
+            n_mfcc=self.config.n_mfcc
         )
         
         # Chroma features  
         chroma = librosa.feature.chroma_stft(
-            y=y, sr=sr,
-            hop_length=self.config.hop_length,
+            S=power, sr=sr,
             n_chroma=self.config.n_chroma
         )
         
         # Spectral features
-        spectral_centroids = librosa.feature.spectral_centroid(
-            y=y, sr=sr, hop_length=self.config.hop_length
-        )[0]
+        spectral_centroids = librosa.feature.spectral_centroid(S=S, sr=sr)[0]
         
-        spectral_rolloff = librosa.feature.spectral_rolloff(
-            y=y, sr=sr, hop_length=self.config.hop_length
-        )[0]
+        spectral_rolloff = librosa.feature.spectral_rolloff(S=S, sr=sr)[0]
         
-        spectral_bandwidth = librosa.feature.spectral_bandwidth(
-            y=y, sr=sr, hop_length=self.config.hop_length
-        )[0]
+        spectral_bandwidth = librosa.feature.spectral_bandwidth(S=S, sr=sr)[0]
         
         zero_crossing_rate = librosa.feature.zero_crossing_rate(
             y, hop_length=self.config.hop_length
@@ -93,10 +141,10 @@ class FeatureExtractor:
         
         return {
             "mfcc": mfcc.tolist(),
-            "mfcc_mean": np.mean(mfcc, axis=1).tolist(),
-            "mfcc_std": np.std(mfcc, axis=1).tolist(),
+            "mfcc_mean": np.mean(mfcc, axis=1, dtype=np.float32).tolist(),
+            "mfcc_std": np.std(mfcc, axis=1, dtype=np.float32).tolist(),
             "chroma": chroma.tolist(),
-            "chroma_mean": np.mean(chroma, axis=1).tolist(),
+            "chroma_mean": np.mean(chroma, axis=1, dtype=np.float32).tolist(),
             "spectral_centroid": spectral_centroids.tolist(),
             "spectral_rolloff": spectral_rolloff.tolist(), 
             "spectral_bandwidth": spectral_bandwidth.tolist(),
@@ -106,14 +154,19 @@ class FeatureExtractor:
     def _extract_rhythm_features(self, y: np.ndarray, sr: int) -> Dict:
         """Extract rhythm and tempo features."""
         
+        # Onset envelope shared by beat tracking, onset detection and the tempogram
+        onset_env = librosa.onset.onset_strength(
+            y=y, sr=sr, hop_length=self.config.hop_length
+        )
+        
         # Tempo and beat tracking
         tempo, beats = librosa.beat.beat_track(
-            y=y, sr=sr, hop_length=self.config.hop_length
+            onset_envelope=onset_env, sr=sr, hop_length=self.config.hop_length
         )
         
         # Onset detection
         onset_frames = librosa.onset.onset_detect(
-            y=y, sr=sr, hop_length=self.config.hop_length
+            onset_envelope=onset_env, sr=sr, hop_length=self.config.hop_length
         )
         onset_times = librosa.frames_to_time(
             onset_frames, sr=sr, hop_length=self.config.hop_length
@@ -121,7 +174,7 @@ class FeatureExtractor:
         
         # Rhythm patterns
         tempogram = librosa.feature.tempogram(
-            y=y, sr=sr, hop_length=self.config.hop_length
+            onset_envelope=onset_env, sr=sr, hop_length=self.config.hop_length
         )
         
         return {
@@ -131,10 +184,8 @@ class FeatureExtractor:
                 beats, sr=sr, hop_length=self.config.hop_length
             ).tolist(),
             "onsets": onset_times.tolist(),
-            "onset_strength": librosa.onset.onset_strength(
-                y=y, sr=sr, hop_length=self.config.hop_length
-            ).tolist(),
-            "tempogram_mean": np.mean(tempogram, axis=1).tolist(),
+            "onset_strength": onset_env.tolist(),
+            "tempogram_mean": np.mean(tempogram, axis=1, dtype=np.float32).tolist(),
         }
     
     def _extract_harmonic_features(self, y: np.ndarray, sr: int) -> Dict:
@@ -158,18 +209,22 @@ class FeatureExtractor:
         
         return {
             "tonnetz": tonnetz.tolist(),
-            "tonnetz_mean": np.mean(tonnetz, axis=1).tolist(),
+            "tonnetz_mean": np.mean(tonnetz, axis=1, dtype=np.float32).tolist(),
             "harmonic_energy": float(np.sum(y_harmonic**2)),
             "percussive_energy": float(np.sum(y_percussive**2)),
             "harmonic_percussive_ratio": float(
                 np.sum(y_harmonic**2) / (np.sum(y_percussive**2) + 1e-8)
             ),
             "chroma_cqt": chroma.tolist(),
-            "chroma_cqt_mean": np.mean(chroma, axis=1).tolist(),
+            "chroma_cqt_mean": np.mean(chroma, axis=1, dtype=np.float32).tolist(),
         }
     
-    def _extract_energy_features(self, y: np.ndarray, sr: int) -> Dict:
+    def _extract_energy_features(
+        self, y: np.ndarray, sr: int, S: Optional[np.ndarray] = None
+    ) -> Dict:
         """Extract energy and dynamics features."""
+        if S is None:
+            S = self._magnitude_spectrogram(y)
         
         # RMS energy
         rms = librosa.feature.rms(
@@ -178,9 +233,8 @@ class FeatureExtractor:
         
         # Mel-frequency features
         mel_spectrogram = librosa.feature.melspectrogram(
-            y=y, sr=sr, 
-            n_mels=self.config.n_mel,
-            hop_length=self.config.hop_length
+            S=S ** 2, sr=sr, 
+            n_mels=self.config.n_mel
         )
         
         # Convert to dB
@@ -192,7 +246,7 @@ class FeatureExtractor:
             "rms_std": float(np.std(rms)),
             "dynamic_range": float(np.max(rms) - np.min(rms)),
             "mel_spectrogram": mel_db.tolist(),
-            "mel_mean": np.mean(mel_db, axis=1).tolist(),
+            "mel_mean": np.mean(mel_db, axis=1, dtype=np.float32).tolist(),
             "overall_loudness": float(np.mean(librosa.amplitude_to_db(rms))),
         }
     
@@ -233,26 +287,58 @@ class FeatureExtractor:
         end_time: float
     ) -> Dict:
         """Extract features for a specific time range."""
+        self._check_audio_file(audio_path)
+        
         try:
-            y, sr = librosa.load(
-                audio_path, 
-                sr=self.config.sample_rate,
-                offset=start_time,
-                duration=end_time - start_time
-            )
+            y, sr = self._read_time_range(audio_path, start_time, end_time)
             
             return self.extract_all_features_from_array(y, sr)
             
-        except Exception as e:
+        except _DECODE_ERRORS as e:
             raise AudioProcessingError(f"Time range feature extraction failed: {str(e)}")
     
+    def _read_time_range(
+        self,
+        audio_path: str,
+        start_time: float,
+        end_time: float
+    ) -> Tuple[np.ndarray, int]:
+        """Read only the samples between start_time and end_time.
+        
+        When the file is already at the target rate, seek straight to the
+        section with soundfile so memory stays proportional to the section,
+        not the whole file.
+        """
+        sr = self._load_sample_rate(audio_path)
+        if sr is None:
+            sr = self.config.sample_rate
+            y, _ = sf.read(
+                audio_path,
+                start=int(start_time * sr),
+                stop=int(end_time * sr),
+                dtype="float32",
+                always_2d=True
+            )
+            return librosa.to_mono(y.T), sr
+        
+        return librosa.load(
+            audio_path, 
+            sr=sr,
+            offset=start_time,
+            duration=end_time - start_time,
+            dtype=np.float32
+        )
+    
     def extract_all_features_from_array(self, y: np.ndarray, sr: int) -> Dict:
         """Extract features from audio array instead of file."""
+        # Keep the whole feature pipeline in single precision
+        y = np.asarray(y, dtype=np.float32)
+        S = self._magnitude_spectrogram(y)
         features = {
-            "spectral": self._extract_spectral_features(y, sr),
+            "spectral": self._extract_spectral_features(y, sr, S),
             "rhythm": self._extract_rhythm_features(y, sr),
             "harmonic": self._extract_harmonic_features(y, sr),
-            "energy": self._extract_energy_features(y, sr),
+            "energy": self._extract_energy_features(y, sr, S),
             "temporal": self._extract_temporal_features(y, sr),
         }
         
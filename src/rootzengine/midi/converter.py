@@ -1,10 +1,14 @@
 """Convert audio structure analysis to a MIDI file."""
 
 import logging
-from typing import Dict
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pretty_midi
-from rootzengine.midi.patterns import MIDIPatternGenerator
+from rootzengine.midi.patterns import BASS_PROGRAM, MIDIPatternGenerator, NoteBuffer
+from rootzengine.midi.writer import write_midi
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +16,20 @@ logger = logging.getLogger(__name__)
 class AudioToMIDIConverter:
     """Converts a structured audio analysis into a coherent MIDI file."""
 
+    # (pattern_type, bass_style) for common section labels
+    LABEL_STYLES = {
+        "chorus": ("steppers", "complex"),
+        "verse": ("one_drop", "simple"),
+        "intro": ("heartbeat", "minimal"),
+        "outro": ("heartbeat", "minimal"),
+        "bridge": ("rockers", "simple"),
+    }
+    DEFAULT_STYLES = ("rockers", "simple")
+
+    # Below this many bars of distinct patterns, generating them inline is
+    # faster than starting worker threads
+    PARALLEL_MIN_BARS = 2000
+
     def __init__(self, analysis_data: Dict):
         """Initialize the converter with audio analysis results.
 
@@ -36,67 +54,154 @@ class AudioToMIDIConverter:
         Returns:
             A dictionary of parameters for the MIDIPatternGenerator.
         """
-        # Default parameters
-        params = {
-            "pattern_type": "rockers",
-            "bass_style": "simple",
+        label_lower = section_label.lower().strip()
+        pattern_type, bass_style = self.LABEL_STYLES.get(label_lower) or self._match_label(label_lower)
+
+        return {
+            "pattern_type": pattern_type,
+            "bass_style": bass_style,
             "skank_style": "traditional",
         }
 
-        label_lower = section_label.lower()
-
-        if "chorus" in label_lower:
-            params["pattern_type"] = "steppers"
-            params["bass_style"] = "complex"
-        elif "verse" in label_lower:
-            params["pattern_type"] = "one_drop"
-            params["bass_style"] = "simple"
-        elif "intro" in label_lower or "outro" in label_lower:
-            params["pattern_type"] = "heartbeat"
-            params["bass_style"] = "minimal"
-        
-        return params
+    def _match_label(self, label_lower: str) -> Tuple[str, str]:
+        """Finds the styles for a label that is not an exact known label.
+
+        Args:
+            label_lower: The lowercased section label (e.g., 'chorus 2').
+
+        Returns:
+            A (pattern_type, bass_style) tuple.
+        """
+        for keyword in ("chorus", "verse", "intro", "outro"):
+            if keyword in label_lower:
+                return self.LABEL_STYLES[keyword]
+
+        return self.DEFAULT_STYLES
+
+    def _plan_sections(self, sections: List[Dict]) -> List[Optional[Tuple[int, Tuple]]]:
+        """Works out what needs to be generated for each section.
+
+        Args:
+            sections: Section dictionaries with 'start', 'end' and 'label' keys.
+
+        Returns:
+            A hashable (measures, params) plan per section, or None for
+            sections shorter than half a bar.
+        """
+        if not sections:
+            return []
+
+        starts = np.array([section["start"] for section in sections])
+        ends = np.array([section["end"] for section in sections])
+        measures = np.rint((ends - starts) / (60.0 / self.tempo * 4)).astype(int)
+
+        plans = []
+        for section, section_measures in zip(sections, measures.tolist()):
+            if section_measures == 0:
+                plans.append(None)
+                continue
+
+            params = self._map_section_to_params(section["label"])
+            plans.append((section_measures, tuple(sorted(params.items()))))
+
+        return plans
+
+    def _generate_section(self, plan: Tuple[int, Tuple]) -> Tuple[NoteBuffer, NoteBuffer]:
+        """Generates the drum and bass notes for a section plan.
+
+        Args:
+            plan: A (measures, params) plan from _plan_sections.
+
+        Returns:
+            A (drum_notes, bass_notes) tuple of note buffers with times
+            relative to the section start.
+        """
+        measures, params = plan
+        params = dict(params)
+        # Only drums and bass are generated, so there is no skank to style
+        params.pop("skank_style", None)
+        return self.generator.generate_pattern_notes(measures=measures, key=self.key, mode=self.mode, **params)
 
     def generate(self) -> pretty_midi.PrettyMIDI:
         """Generates a full MIDI file from the analysis data.
 
+        Sections that repeat (every verse, every chorus) share the same
+        pattern, so each distinct plan is generated once (concurrently for
+        very long songs) and then placed at every section that uses it.
+
         Returns:
             A PrettyMIDI object representing the entire song.
         """
         final_midi = pretty_midi.PrettyMIDI(initial_tempo=self.tempo)
         
         # Ensure instruments are created once and shared
-        final_midi.instruments.append(pretty_midi.Instrument(program=0, is_drum=True, name="Drums"))
-        final_midi.instruments.append(pretty_midi.Instrument(program=33, name="Electric Bass"))
-
-        for section in self.analysis.get("sections", []):
-            start_time = section["start"]
-            end_time = section["end"]
-            duration = end_time - start_time
-            measures = int(round(duration / (60.0 / self.tempo * 4)))
-
-            if measures == 0:
+        drums = pretty_midi.Instrument(program=0, is_drum=True, name="Drums")
+        bass = pretty_midi.Instrument(program=BASS_PROGRAM, name="Electric Bass")
+        final_midi.instruments.append(drums)
+        final_midi.instruments.append(bass)
+
+        sections = self.analysis.get("sections", [])
+        plans = self._plan_sections(sections)
+        unique_plans = list(dict.fromkeys(plan for plan in plans if plan is not None))
+
+        if sum(measures for measures, _ in unique_plans) >= self.PARALLEL_MIN_BARS:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                generated = dict(zip(unique_plans, executor.map(self._generate_section, unique_plans)))
+        else:
+            generated = {plan: self._generate_section(plan) for plan in unique_plans}
+
+        # Place the shared patterns in section order, offset by start time,
+        # and only build pretty_midi notes once the whole song is laid out
+        drum_parts, bass_parts = [], []
+        for section, plan in zip(sections, plans):
+            if plan is None:
                 continue
 
-            params = self._map_section_to_params(section["label"])
-            section_midi = self.generator.generate_pattern(measures=measures, key=self.key, mode=self.mode, **params)
-
-            # Append notes from the generated section, offsetting by start time
-            for instrument in section_midi.instruments:
-                target_instrument = final_midi.instruments[0] if instrument.is_drum else final_midi.instruments[1]
-                for note in instrument.notes:
-                    note.start += start_time
-                    note.end += start_time
-                    target_instrument.notes.append(note)
+            drum_notes, bass_notes = generated[plan]
+            drum_parts.append((section["start"], drum_notes))
+            bass_parts.append((section["start"], bass_notes))
+
+        drums.notes = self._place_notes(drum_parts).to_notes()
+        bass.notes = self._place_notes(bass_parts).to_notes()
         
         return final_midi
 
+    @staticmethod
+    def _place_notes(parts: List[Tuple[float, NoteBuffer]]) -> NoteBuffer:
+        """Joins section note buffers, shifting each by its section start time.
+
+        Args:
+            parts: (start_time, notes) pairs in song order.
+
+        Returns:
+            A single buffer covering the whole song, ordered by start time
+            and then pitch.
+        """
+        if not parts:
+            return NoteBuffer.concatenate([])
+
+        start_times, buffers = zip(*parts)
+        notes = NoteBuffer.concatenate(list(buffers))
+        notes.offset(np.repeat(np.asarray(start_times, dtype=np.float32), [len(buf) for buf in buffers]))
+
+        # Sections are not guaranteed to arrive in time order, so sort once
+        # here rather than relying on placement order
+        notes.sort()
+        return notes
+
     def save(self, midi_data: pretty_midi.PrettyMIDI, output_path: str):
         """Saves the PrettyMIDI object to a file.
 
+        The tempo is read from midi_data itself. MIDI with a single tempo
+        goes through the direct writer; a tempo map is left to PrettyMIDI.
+
         Args:
             midi_data: The MIDI object to save.
             output_path: The path to save the .mid file.
         """
-        midi_data.write(output_path)
+        _, tempi = midi_data.get_tempo_changes()
+        if len(tempi) == 1:
+            write_midi(midi_data, output_path, float(tempi[0]))
+        else:
+            midi_data.write(output_path)
         logger.info(f"MIDI file saved to {output_path}")
\ No newline at end of file
@@ -1,13 +1,141 @@
 """Authentic reggae MIDI pattern library."""
 
+import functools
+import warnings
+
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+import pretty_midi
+from pathlib import Path
+from typing import Dict, List, Set, Tuple, Optional, Union
 from enum import Enum
 from dataclasses import dataclass
 import logging
 
+from rootzengine.midi.writer import encode_midi, write_bytes
+
 logger = logging.getLogger(__name__)
 
+# GM program used for generated basslines
+BASS_PROGRAM = pretty_midi.instrument_name_to_program('Electric Bass (finger)')
+
+# Pattern specs: one bar of (beat, note, length in beats, velocity) events.
+# Drum notes are GM percussion keys; bass notes are indices into the scale.
+_HIHATS = tuple((i / 2, 42, 0.25, 80 if i % 2 == 0 else 60) for i in range(8))
+
+_DRUM_SPECS = {
+    # Kick and rim together on the "drop" of beat 3
+    "one_drop": _HIHATS + ((2.0, 36, 0.5, 110), (2.0, 38, 0.25, 100)),
+    # Four-on-the-floor kick
+    "steppers": _HIHATS + tuple((float(beat), 36, 0.5, 105) for beat in range(4)) + ((2.0, 38, 0.25, 100),),
+    # Kick on 1 and 3; also used for unknown riddims
+    "rockers": _HIHATS + ((0.0, 36, 0.5, 110), (2.0, 36, 0.5, 110), (2.0, 38, 0.25, 100)),
+}
+
+_BASS_SPECS = {
+    # Root on the downbeat, held for half a bar
+    "minimal": ((0.0, 0, 2.0, 90),),
+    # Root on beat 1, fifth on beat 3
+    "simple": ((0.0, 0, 1.5, 95), (2.0, 4, 1.5, 95)),
+    # Walking line up the scale; also used for unknown styles
+    "complex": ((0.0, 0, 0.9, 90), (1.0, 2, 0.9, 90), (2.0, 4, 0.9, 90), (3.0, 5, 0.9, 90)),
+}
+
+
+# Semitone offsets of each scale degree, and the shift from the root's
+# octave 4 down to the bass register
+_SCALE_STEPS = {
+    "major": np.array([0, 2, 4, 5, 7, 9, 11]),
+    "minor": np.array([0, 2, 3, 5, 7, 8, 10]),
+}
+_BASS_OCTAVE = -24
+
+
+@functools.lru_cache(maxsize=None)
+def _root_pitch(key: str) -> int:
+    """Get the MIDI pitch of a key's root in octave 4."""
+    return pretty_midi.note_name_to_number(f"{key}4")
+
+
+@functools.lru_cache(maxsize=None)
+def _spec_columns(spec: Tuple[Tuple[float, int, float, int], ...]) -> Tuple[np.ndarray, ...]:
+    """Split a pattern spec into (beats, notes, lengths, velocities) arrays.
+    
+    Specs are immutable module constants, so each is only converted once.
+    Events are ordered by beat and then note here, which keeps every
+    generated bar (and so the whole pattern) in time order without sorting
+    the generated notes.
+    """
+    return tuple(np.array(column) for column in zip(*sorted(spec)))
+
+
+@dataclass
+class NoteBuffer:
+    """Notes held as parallel arrays, one per field, until they are needed as pretty_midi objects."""
+    velocities: np.ndarray  # uint8
+    pitches: np.ndarray  # uint8
+    starts: np.ndarray  # float32 seconds
+    ends: np.ndarray  # float32 seconds
+    
+    @classmethod
+    def from_columns(cls, velocities, pitches, starts, ends) -> "NoteBuffer":
+        """Build a buffer, casting each column to its compact dtype."""
+        return cls(
+            np.asarray(velocities, dtype=np.uint8).ravel(),
+            np.asarray(pitches, dtype=np.uint8).ravel(),
+            np.asarray(starts, dtype=np.float32).ravel(),
+            np.asarray(ends, dtype=np.float32).ravel(),
+        )
+    
+    @classmethod
+    def concatenate(cls, buffers: List["NoteBuffer"]) -> "NoteBuffer":
+        """Join buffers end to end into a new buffer."""
+        if not buffers:
+            return cls.from_columns([], [], [], [])
+        return cls(
+            np.concatenate([buf.velocities for buf in buffers]),
+            np.concatenate([buf.pitches for buf in buffers]),
+            np.concatenate([buf.starts for buf in buffers]),
+            np.concatenate([buf.ends for buf in buffers]),
+        )
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def copy(self) -> "NoteBuffer":
+        """Get a writable copy of the buffer."""
+        return NoteBuffer(
+            self.velocities.copy(), self.pitches.copy(), self.starts.copy(), self.ends.copy()
+        )
+    
+    def freeze(self) -> "NoteBuffer":
+        """Make the buffer's arrays read-only so it can be shared, and return it."""
+        for column in (self.velocities, self.pitches, self.starts, self.ends):
+            column.flags.writeable = False
+        return self
+    
+    def offset(self, seconds) -> None:
+        """Shift notes in place by a scalar or per-note array of seconds."""
+        self.starts += seconds
+        self.ends += seconds
+    
+    def sort(self) -> None:
+        """Order notes in place by start time, then pitch."""
+        order = np.lexsort((self.pitches, self.starts))
+        self.velocities = self.velocities[order]
+        self.pitches = self.pitches[order]
+        self.starts = self.starts[order]
+        self.ends = self.ends[order]
+    
+    def to_notes(self) -> List[pretty_midi.Note]:
+        """Materialize the buffer as pretty_midi notes."""
+        return [
+            pretty_midi.Note(velocity, pitch, start, end)
+            for velocity, pitch, start, end in zip(
+                self.velocities.tolist(), self.pitches.tolist(),
+                self.starts.tolist(), self.ends.tolist()
+            )
+        ]
+
 
 class RiddimType(Enum):
     """Reggae riddim types."""
@@ -450,27 +578,201 @@ class MidiPatternAnalyzer:
 
 
 class MIDIPatternGenerator:
-    """Generates MIDI patterns based on reggae riddim types."""
+    """Generates drum and bass MIDI parts for reggae song sections."""
+    
+    # Output directories known to exist in this process; an entry is dropped
+    # again if its directory turns out to have been removed
+    _created_dirs: Set[Path] = set()
+    
+    # Distinct patterns whose note buffers each generator keeps
+    PATTERN_CACHE_SIZE = 128
     
     def __init__(self, tempo: float = 120.0):
         """Initialize generator with tempo."""
         self.tempo = tempo
+        self.beat_duration = 60.0 / tempo
         self.library = ReggaePatternLibrary()
+        # Read-only note buffers per (pattern_type, key, mode, measures, bass_style)
+        self._cached_buffers = functools.lru_cache(maxsize=self.PATTERN_CACHE_SIZE)(self._pattern_buffers)
+    
+    def generate_pattern(
+        self,
+        pattern_type: Union[str, RiddimType] = "one_drop",
+        key: str = "C",
+        mode: str = "major",
+        measures: int = 4,
+        bass_style: str = "simple",
+        skank_style: str = "traditional",
+        output_path: Optional[str] = None,
+        riddim_type: Optional[RiddimType] = None
+    ) -> Union[pretty_midi.PrettyMIDI, MIDIPattern]:
+        """
+        Generate a drum and bass pattern.
+        
+        Passing a RiddimType (positionally or as riddim_type) is the old
+        generate_pattern(riddim_type) -> MIDIPattern API; it still returns
+        riddim_pattern(riddim_type) but is deprecated.
+        
+        Args:
+            pattern_type: Drum riddim ("one_drop", "steppers", "rockers");
+                unknown types fall back to rockers
+            key: Root note of the key (e.g. "A", "F#")
+            mode: "major" or "minor"
+            measures: Number of 4/4 bars to generate
+            bass_style: Bassline style ("minimal", "simple", "complex")
+            skank_style: Skank style; only drums and bass are generated for now
+            output_path: Optional path to also write the pattern as a .mid file
+            riddim_type: Deprecated; see above
+            
+        Returns:
+            PrettyMIDI object with a drum and a bass instrument
+        """
+        if riddim_type is not None or isinstance(pattern_type, RiddimType):
+            warnings.warn(
+                "generate_pattern(riddim_type) is deprecated; use riddim_pattern() for a "
+                "library MIDIPattern or pass a pattern name to generate MIDI",
+                DeprecationWarning,
+                stacklevel=2
+            )
+            return self.riddim_pattern(riddim_type if riddim_type is not None else pattern_type)
+        
+        # Normalize once so "Minor" and "minor" share cached notes
+        mode = mode.lower()
+        drum_buf, bass_buf = self._cached_buffers(pattern_type, key, mode, measures, bass_style)
+        
+        midi_data = pretty_midi.PrettyMIDI(initial_tempo=self.tempo)
+        drums = pretty_midi.Instrument(program=0, is_drum=True, name="Drums")
+        bass = pretty_midi.Instrument(
+            program=BASS_PROGRAM,
+            name="Electric Bass"
+        )
+        drums.notes = drum_buf.to_notes()
+        bass.notes = bass_buf.to_notes()
+        midi_data.instruments.append(drums)
+        midi_data.instruments.append(bass)
+        
+        if output_path:
+            self._write_output(Path(output_path), encode_midi(midi_data, self.tempo))
+            logger.info("Generated %s pattern and saved to %s", pattern_type, output_path)
+        
+        return midi_data
+    
+    def _write_output(self, output_path: Path, data: bytes) -> None:
+        """Write a pattern file, creating its directory the first time it is used.
+        
+        If the directory was removed after it was cached as existing, the
+        entry is dropped, the directory re-created and the write retried.
+        """
+        output_dir = output_path.parent
+        if output_dir not in self._created_dirs:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(output_dir)
+        try:
+            write_bytes(output_path, data)
+        except FileNotFoundError:
+            self._created_dirs.discard(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(output_dir)
+            write_bytes(output_path, data)
     
-    def generate_pattern(self, riddim_type: RiddimType = RiddimType.ONE_DROP) -> MIDIPattern:
-        """Generate a MIDI pattern for the specified riddim type."""
-        patterns = self.library.get_patterns(riddim_type)
+    def riddim_pattern(self, riddim_type: RiddimType = RiddimType.ONE_DROP) -> MIDIPattern:
+        """Get the library's first pattern for a riddim type, or an empty one if it has none."""
+        patterns = self.library.patterns.get(riddim_type)
         if patterns:
-            return patterns[0]  # Return first pattern for now
+            return next(iter(patterns.values()))
         
-        # Return basic pattern if none found
         return MIDIPattern(
             name=f"Basic {riddim_type.value}",
-            riddim_type=riddim_type,
-            tempo=self.tempo,
-            time_signature=(4, 4),
-            drum_pattern=[],
-            bass_pattern=[],
-            chords_pattern=[],
-            duration_bars=4
-        )
\ No newline at end of file
+            notes=[],
+            length_beats=16.0,
+            tempo_range=self.library.get_compatible_tempo(riddim_type),
+            description=f"Empty {riddim_type.value} pattern"
+        )
+    
+    def generate_pattern_notes(
+        self,
+        pattern_type: str = "one_drop",
+        key: str = "C",
+        mode: str = "major",
+        measures: int = 4,
+        bass_style: str = "simple"
+    ) -> Tuple[NoteBuffer, NoteBuffer]:
+        """
+        Generate a drum and bass pattern as note buffers.
+        
+        This is generate_pattern without the pretty_midi objects, for callers
+        that combine several patterns before building the final MIDI.
+        
+        Args:
+            pattern_type: Drum riddim ("one_drop", "steppers", "rockers");
+                unknown types fall back to rockers
+            key: Root note of the key (e.g. "A", "F#")
+            mode: "major" or "minor"
+            measures: Number of 4/4 bars to generate
+            bass_style: Bassline style ("minimal", "simple", "complex")
+            
+        Returns:
+            (drum_notes, bass_notes) buffers in time order
+        """
+        drum_buf, bass_buf = self._cached_buffers(pattern_type, key, mode.lower(), measures, bass_style)
+        # Callers shift and sort the returned buffers, so they get their own copies
+        return drum_buf.copy(), bass_buf.copy()
+    
+    def _pattern_buffers(
+        self,
+        pattern_type: str,
+        key: str,
+        mode: str,
+        measures: int,
+        bass_style: str
+    ) -> Tuple[NoteBuffer, NoteBuffer]:
+        """Build read-only drum and bass buffers for an already-lowercased mode.
+        
+        Results are shared through _cached_buffers, so their arrays are
+        frozen to catch accidental in-place changes.
+        """
+        drum_spec = _DRUM_SPECS.get(pattern_type, _DRUM_SPECS["rockers"])
+        bass_spec = _BASS_SPECS.get(bass_style, _BASS_SPECS["complex"])
+        
+        drum_notes = self._pattern_notes(drum_spec, measures)
+        bass_notes = self._pattern_notes(bass_spec, measures, self._bass_scale_pitches(key, mode))
+        
+        return drum_notes.freeze(), bass_notes.freeze()
+    
+    def _bass_scale_pitches(self, key: str, mode: str) -> np.ndarray:
+        """Get the bass-register MIDI pitch of each scale degree for a lowercase mode."""
+        scale_steps = _SCALE_STEPS["major"] if mode == "major" else _SCALE_STEPS["minor"]
+        return _root_pitch(key) + _BASS_OCTAVE + scale_steps
+    
+    def _pattern_notes(
+        self,
+        spec: Tuple[Tuple[float, int, float, int], ...],
+        measures: int,
+        pitch_map: Optional[np.ndarray] = None
+    ) -> NoteBuffer:
+        """
+        Lay a one-bar pattern spec out over consecutive bars.
+        
+        Args:
+            spec: (beat, note, length in beats, velocity) events for one bar
+            measures: Number of bars to generate
+            pitch_map: Maps spec notes to MIDI pitches (scale degrees for
+                bass); spec notes are used as-is when omitted
+            
+        Returns:
+            Buffer of the notes in bar order
+        """
+        beats, spec_notes, lengths, velocities = _spec_columns(spec)
+        pitches = spec_notes if pitch_map is None else pitch_map[spec_notes]
+        
+        # One row per bar, one column per event in the bar
+        bar_starts = np.arange(measures) * (4 * self.beat_duration)
+        starts = bar_starts[:, None] + beats * self.beat_duration
+        
+        shape = starts.shape
+        return NoteBuffer.from_columns(
+            np.broadcast_to(velocities, shape),
+            np.broadcast_to(pitches, shape),
+            starts,
+            starts + lengths * self.beat_duration
+        )
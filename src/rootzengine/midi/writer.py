@@ -0,0 +1,227 @@
+"""Direct MIDI file writing for generated, fixed-tempo songs."""
+
+import logging
+import os
+import struct
+from typing import List, Tuple
+
+import numpy as np
+import pretty_midi
+
+logger = logging.getLogger(__name__)
+
+try:
+    import symusic
+    SYMUSIC_AVAILABLE = True
+except ImportError:
+    SYMUSIC_AVAILABLE = False
+
+DRUM_CHANNEL = 9
+
+_NOTE_OFF = 0x80
+_NOTE_ON = 0x90
+_PROGRAM_CHANGE = 0xC0
+_END_OF_TRACK = b"\x00\xff\x2f\x00"
+
+
+def _vlq(value: int) -> bytes:
+    """Encode a delta time as a MIDI variable-length quantity."""
+    out = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        out.append(0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(reversed(out))
+
+
+def _meta_event(meta_type: int, data: bytes) -> bytes:
+    """Encode a meta event at delta time 0."""
+    return b"\x00\xff" + bytes([meta_type]) + _vlq(len(data)) + data
+
+
+def _track_chunk(events: bytes) -> bytes:
+    """Wrap encoded events in an MTrk chunk."""
+    return b"MTrk" + struct.pack(">I", len(events)) + events
+
+
+def _note_arrays(
+    instrument: pretty_midi.Instrument,
+    ticks_per_second: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Get an instrument's (start_ticks, end_ticks, pitches, velocities) arrays."""
+    notes = instrument.notes
+    times = np.array([(note.start, note.end) for note in notes]).reshape(-1, 2)
+    ticks = np.round(times * ticks_per_second).astype(np.int64)
+    # A note must end at least a tick after it starts; otherwise its
+    # note_off sorts before its note_on and the note hangs
+    ticks[:, 1] = np.maximum(ticks[:, 1], ticks[:, 0] + 1)
+    pitches = np.array([note.pitch for note in notes], dtype=np.int64)
+    velocities = np.array([note.velocity for note in notes], dtype=np.int64)
+    return ticks[:, 0], ticks[:, 1], pitches, velocities
+
+
+def _encode_note_events(
+    deltas: np.ndarray,
+    statuses: np.ndarray,
+    pitches: np.ndarray,
+    velocities: np.ndarray
+) -> bytes:
+    """Encode channel note events without a Python loop per event.
+
+    Each event is laid out as a row of four variable-length delta bytes,
+    a status byte and two data bytes; a mask then drops the unused leading
+    delta bytes and, with running status, repeated status bytes.
+    """
+    shifts = np.array([21, 14, 7, 0])
+    vlq = (deltas[:, None] >> shifts) & 0x7F
+    vlq[:, :3] |= 0x80
+    n_vlq = 1 + (deltas >= 1 << 7) + (deltas >= 1 << 14) + (deltas >= 1 << 21)
+    keep_vlq = np.arange(4) >= (4 - n_vlq)[:, None]
+
+    keep_status = np.ones(len(statuses), dtype=bool)
+    keep_status[1:] = statuses[1:] != statuses[:-1]
+
+    rows = np.column_stack([vlq, statuses, pitches, velocities]).astype(np.uint8)
+    keep = np.column_stack([keep_vlq, keep_status, np.ones((len(statuses), 2), dtype=bool)])
+    return rows[keep].tobytes()
+
+
+def _instrument_track(
+    instrument: pretty_midi.Instrument,
+    channel: int,
+    ticks_per_second: float
+) -> bytes:
+    """Encode a MIDI track holding one instrument's notes."""
+    events = bytearray()
+    events += _meta_event(0x03, instrument.name.encode("latin-1", errors="replace"))
+    events += bytes([0x00, _PROGRAM_CHANGE | channel, instrument.program])
+
+    if instrument.notes:
+        start_ticks, end_ticks, pitches, velocities = _note_arrays(instrument, ticks_per_second)
+
+        # Interleave note_on/note_off events and order them by tick, placing
+        # note_offs first so a re-struck note is not cut short
+        ticks = np.concatenate([start_ticks, end_ticks])
+        is_on = np.concatenate([np.ones(len(pitches), dtype=bool), np.zeros(len(pitches), dtype=bool)])
+        order = np.lexsort((is_on, ticks))
+        deltas = np.diff(ticks[order], prepend=0)
+
+        statuses = np.where(is_on[order], _NOTE_ON | channel, _NOTE_OFF | channel)
+        event_pitches = np.concatenate([pitches, pitches])[order]
+        event_velocities = np.where(is_on, np.concatenate([velocities, velocities]), 0)[order]
+        events += _encode_note_events(deltas, statuses, event_pitches, event_velocities)
+
+    events += _END_OF_TRACK
+    return _track_chunk(bytes(events))
+
+
+def _assign_channels(instruments: List[pretty_midi.Instrument]) -> List[int]:
+    """Assign MIDI channels, keeping drums on channel 10."""
+    channels = []
+    melodic_channels = (ch for ch in range(16) if ch != DRUM_CHANNEL)
+    for instrument in instruments:
+        if instrument.is_drum:
+            channels.append(DRUM_CHANNEL)
+        else:
+            channels.append(next(melodic_channels, 0))
+    return channels
+
+
+def encode_midi(
+    midi_data: pretty_midi.PrettyMIDI,
+    tempo: float,
+    ticks_per_beat: int = 480
+) -> bytes:
+    """
+    Encode a fixed-tempo PrettyMIDI object as Standard MIDI File bytes.
+
+    Generated songs use a single tempo, so seconds map linearly onto ticks
+    and the file bytes can be emitted directly instead of going through
+    PrettyMIDI.write or a mido object per event. When symusic is installed
+    its C++ encoder is used instead.
+
+    Args:
+        midi_data: The MIDI object to encode
+        tempo: Tempo of the song in BPM
+        ticks_per_beat: MIDI resolution (pulses per quarter note)
+
+    Returns:
+        The contents of a type 1 .mid file
+    """
+    if SYMUSIC_AVAILABLE:
+        return _encode_with_symusic(midi_data, tempo, ticks_per_beat)
+
+    microseconds_per_beat = int(round(60_000_000 / tempo))
+    conductor = _track_chunk(
+        _meta_event(0x51, microseconds_per_beat.to_bytes(3, "big"))
+        # 4/4, 24 clocks per click, 8 32nds per quarter
+        + _meta_event(0x58, bytes([4, 2, 24, 8]))
+        + _END_OF_TRACK
+    )
+    tracks = [conductor]
+
+    ticks_per_second = ticks_per_beat * tempo / 60.0
+    channels = _assign_channels(midi_data.instruments)
+    for instrument, channel in zip(midi_data.instruments, channels):
+        tracks.append(_instrument_track(instrument, channel, ticks_per_second))
+
+    header = b"MThd" + struct.pack(">IHHH", 6, 1, len(tracks), ticks_per_beat)
+    return header + b"".join(tracks)
+
+
+def write_bytes(output_path: str, data: bytes) -> None:
+    """Write encoded file contents in a single os.write where the OS allows it."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(str(output_path), flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def write_midi(
+    midi_data: pretty_midi.PrettyMIDI,
+    output_path: str,
+    tempo: float,
+    ticks_per_beat: int = 480
+) -> None:
+    """
+    Write a fixed-tempo PrettyMIDI object to a .mid file.
+
+    The whole file is encoded in memory first and then written in one call.
+
+    Args:
+        midi_data: The MIDI object to write
+        output_path: Path of the .mid file to create
+        tempo: Tempo of the song in BPM
+        ticks_per_beat: MIDI resolution (pulses per quarter note)
+    """
+    write_bytes(output_path, encode_midi(midi_data, tempo, ticks_per_beat))
+
+
+def _encode_with_symusic(
+    midi_data: pretty_midi.PrettyMIDI,
+    tempo: float,
+    ticks_per_beat: int
+) -> bytes:
+    """Encode a fixed-tempo PrettyMIDI object through a symusic Score."""
+    score = symusic.Score(ticks_per_beat)
+    score.tempos.append(symusic.Tempo(time=0, qpm=tempo))
+    score.time_signatures.append(symusic.TimeSignature(time=0, numerator=4, denominator=4))
+
+    ticks_per_second = ticks_per_beat * tempo / 60.0
+    for instrument in midi_data.instruments:
+        track = symusic.Track(name=instrument.name, program=instrument.program, is_drum=instrument.is_drum)
+        if instrument.notes:
+            start_ticks, end_ticks, pitches, velocities = _note_arrays(instrument, ticks_per_second)
+            track.notes = symusic.Note.from_numpy(
+                time=start_ticks.astype(np.int32),
+                duration=(end_ticks - start_ticks).astype(np.int32),
+                pitch=pitches.astype(np.int8),
+                velocity=velocities.astype(np.int8)
+            )
+        score.tracks.append(track)
+
+    return score.dumps_midi()
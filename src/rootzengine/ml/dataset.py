@@ -7,20 +7,53 @@ from pathlib import Path
 class AudioDataset:
     """Dataset class for audio training data"""
     
-    def __init__(self, data_path: str):
+    def __init__(self, data_path: str, seed: Optional[int] = None):
         self.data_path = Path(data_path)
         self.samples = []
         self.labels = []
+        self._rng = np.random.default_rng(seed)
+        self._epoch_order = np.empty(0, dtype=np.int64)
+        self._cursor = 0
     
     def load_data(self) -> None:
-        """Load training data from disk"""
-        # TODO: Implement data loading
-        pass
+        """Load training data from disk.
+
+        Expects ``features.npy`` (one row of features per sample) and
+        ``labels.npy`` in data_path. Both are memory-mapped, so batches are
+        read from disk on demand instead of loading the whole dataset.
+        """
+        samples = np.load(self.data_path / "features.npy", mmap_mode="r")
+        labels = np.load(self.data_path / "labels.npy", mmap_mode="r")
+        if len(samples) != len(labels):
+            raise ValueError(
+                f"features.npy has {len(samples)} samples but labels.npy has {len(labels)}"
+            )
+
+        self.samples = samples
+        self.labels = labels
+        self._epoch_order = np.empty(0, dtype=np.int64)
+        self._cursor = 0
     
     def get_batch(self, batch_size: int) -> Tuple[np.ndarray, np.ndarray]:
-        """Get a batch of training data"""
-        # TODO: Implement batch generation
-        return np.array([]), np.array([])
+        """Get a batch of training data.
+
+        Samples are drawn without replacement from a shuffled epoch order;
+        the last batch of an epoch may be short, and the next call starts
+        a freshly shuffled epoch.
+        """
+        if len(self) == 0:
+            return np.array([]), np.array([])
+
+        if self._cursor >= len(self._epoch_order):
+            self._epoch_order = self._rng.permutation(len(self))
+            self._cursor = 0
+
+        batch_idx = self._epoch_order[self._cursor:self._cursor + batch_size]
+        self._cursor += len(batch_idx)
+
+        # Reading rows in file order keeps memory-mapped access sequential
+        batch_idx = np.sort(batch_idx)
+        return np.asarray(self.samples[batch_idx]), np.asarray(self.labels[batch_idx])
     
     def __len__(self) -> int:
         return len(self.samples)
@@ -1,18 +1,42 @@
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
+
 class ModelCheckpointManager:
     """Handles saving and loading of model checkpoints."""
-    def __init__(self, checkpoint_dir='models'):
+    def __init__(self, checkpoint_dir='models', use_mmap=True):
         self.checkpoint_dir = checkpoint_dir
+        self.use_mmap = use_mmap
+        # Braces in the directory name are escaped so only the version is formatted
+        escaped_dir = self.checkpoint_dir.replace('{', '{{').replace('}', '}}')
+        self._path_tmpl = os.path.join(escaped_dir, 'model_v{}.pt')
         os.makedirs(self.checkpoint_dir, exist_ok=True)
 
     def save(self, model, version):
-        path = os.path.join(self.checkpoint_dir, f'model_v{version}.pt')
+        path = self._path_tmpl.format(version)
         # ... model.save to path ...
-        print(f'Model saved to {path}')
+        logger.info('Model saved to %s', path)
 
     def load(self, version):
-        path = os.path.join(self.checkpoint_dir, f'model_v{version}.pt')
-        # ... load checkpoint ...
-        print(f'Loaded model from {path}')
-        return None
+        """Load a checkpoint onto the CPU.
+
+        With use_mmap, tensor storages are memory-mapped from the file and
+        paged in on first access instead of being read up front.
+        """
+        import torch
+
+        path = self._path_tmpl.format(version)
+        load_kwargs = {'weights_only': True, 'map_location': 'cpu'}
+        if self.use_mmap:
+            try:
+                checkpoint = torch.load(path, mmap=True, **load_kwargs)
+            except (TypeError, RuntimeError):
+                # torch < 2.1 has no mmap argument, and some filesystems
+                # (or legacy checkpoint formats) cannot be mapped
+                checkpoint = torch.load(path, **load_kwargs)
+        else:
+            checkpoint = torch.load(path, **load_kwargs)
+        logger.info('Loaded model from %s', path)
+        return checkpoint
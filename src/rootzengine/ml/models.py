@@ -3,28 +3,66 @@
 from typing import Any, List, Optional
 import numpy as np
 
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax, shifted by each row's max for numerical stability"""
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
 class ReggaeClassifier:
-    """Classifier for detecting reggae music patterns"""
+    """Classifier for detecting reggae music patterns
+    
+    A multinomial logistic regression over feature rows. Inference for all
+    samples is one matrix product, so it runs through BLAS rather than a
+    Python loop per row.
+    """
     
-    def __init__(self):
+    def __init__(self, learning_rate: float = 0.5, n_iter: int = 200):
         self.model = None
         self.is_trained = False
+        self.learning_rate = learning_rate
+        self.n_iter = n_iter
+        self.classes_: Optional[np.ndarray] = None
+        self._W: Optional[np.ndarray] = None
+        self._b: Optional[np.ndarray] = None
     
     def fit(self, X: np.ndarray, y: np.ndarray) -> None:
-        """Train the classifier"""
-        # TODO: Implement model training
+        """Train the classifier with full-batch gradient descent"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        self.classes_, y_idx = np.unique(y, return_inverse=True)
+        n_samples = len(X)
+
+        # Standardize so one learning rate suits every feature's scale
+        mean = X.mean(axis=0)
+        scale = X.std(axis=0)
+        scale[scale == 0] = 1.0
+        X_std = (X - mean) / scale
+
+        targets = np.eye(len(self.classes_), dtype=np.float32)[y_idx]
+        W = np.zeros((X.shape[1], len(self.classes_)), dtype=np.float32)
+        b = np.zeros(len(self.classes_), dtype=np.float32)
+        for _ in range(self.n_iter):
+            grad = (_softmax(X_std @ W + b) - targets) / n_samples
+            W -= self.learning_rate * (X_std.T @ grad)
+            b -= self.learning_rate * grad.sum(axis=0)
+
+        # Fold the standardization into the weights so inference is a single affine map
+        self._W = np.ascontiguousarray(W / scale[:, None])
+        self._b = b - (mean / scale) @ W
         self.is_trained = True
     
-    def predict(self, X: np.ndarray) -> np.ndarray:
-        """Make predictions"""
+    def _logits(self, X: np.ndarray) -> np.ndarray:
+        """Compute class scores for every sample in one matrix product"""
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction")
-        # TODO: Implement prediction
-        return np.array([])
+        return np.ascontiguousarray(X, dtype=np.float32) @ self._W + self._b
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Make predictions"""
+        # Softmax preserves the argmax, so it is skipped here
+        return self.classes_[np.argmax(self._logits(X), axis=1)]
     
     def predict_proba(self, X: np.ndarray) -> np.ndarray:
-        """Predict class probabilities"""
-        if not self.is_trained:
-            raise ValueError("Model must be trained before prediction")
-        # TODO: Implement probability prediction
-        return np.array([])
+        """Predict class probabilities, one column per entry in classes_"""
+        return _softmax(self._logits(X))
@@ -1,19 +1,43 @@
 """Batch processing system for audio files."""
 
+import asyncio
+import hashlib
+import itertools
+import json
 import logging
+import mmap
+import os
+import queue
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Callable
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
 from rootzengine.audio.analysis import AudioStructureAnalyzer
 from rootzengine.storage.interface import StorageManager
 from rootzengine.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 
 class JobStatus(Enum):
     """Job status enumeration."""
@@ -40,27 +64,241 @@ class ProcessingJob:
             self.created_at = time.time()
 
 
+_PROGRESS_MESSAGE = "%s %s: %.1f%% complete (%d/%d)"
+
+# Bump when analysis output changes so cached results are not reused
+ANALYSIS_CACHE_VERSION = 1
+
+# Per-process analyzer used by process-pool workers
+_worker_analyzer: Optional[AudioStructureAnalyzer] = None
+
+
+def _json_default(value):
+    """Convert numpy arrays and scalars for the json fallback."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_compatible(value):
+    """Convert a result to the types it would have after a JSON round trip.
+    
+    numpy values become Python lists and scalars, tuples become lists and
+    non-string keys become strings, without encoding or parsing any JSON.
+    Values JSON cannot represent are left as they are.
+    """
+    if isinstance(value, dict):
+        return {
+            key if isinstance(key, str) else json.dumps(_json_compatible(key)): _json_compatible(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_json_compatible(item) for item in value]
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    return value
+
+
+def _dump_result(result: Dict) -> bytes:
+    """Serialize an analysis result, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(result, default=_json_default).encode()
+
+
+def _load_result(data: bytes) -> Dict:
+    """Deserialize an analysis result written by _dump_result."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _file_digest(file_path: str) -> str:
+    """Hash a file's contents through a read-only memory map.
+    
+    Hashing the mapping directly avoids copying the audio into Python
+    buffers chunk by chunk.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(str(ANALYSIS_CACHE_VERSION).encode())
+    with open(file_path, "rb") as f:
+        # Empty files cannot be mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            digest.update(mapped)
+    return digest.hexdigest()
+
+
+def _analyze_file(
+    analyzer: AudioStructureAnalyzer,
+    file_path: str,
+    cache_dir: Optional[str] = None,
+    force: bool = False
+) -> Dict:
+    """Analyze one audio file.
+    
+    With a cache_dir, results are also cached by file content, so unchanged
+    audio (under any name) is only analyzed once unless force is set. Cached
+    results come back in their JSON form (lists, string keys) whether or not
+    they were just analyzed, and a failed cache write only logs a warning.
+    Without a cache_dir the analyzer's result is returned unchanged.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = Path(cache_dir) / f"{_file_digest(file_path)}.json"
+    
+    if cache_path is not None and not force and cache_path.is_file():
+        logger.info(f"Using cached analysis for {file_path}")
+        return _load_result(cache_path.read_bytes())
+    
+    result = analyzer.analyze_structure(file_path, perform_separation=False)
+    if cache_path is None:
+        return result
+    
+    # Normalize before serializing so a miss returns exactly what a later hit loads
+    result = _json_compatible(result)
+    try:
+        data = _dump_result(result)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Could not cache analysis for {file_path}: {e}")
+        return result
+    
+    # Write then rename so concurrent workers never read a partial file
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not cache analysis for {file_path}: {e}")
+        tmp_path.unlink(missing_ok=True)
+    
+    return result
+
+
+def _init_worker(analyzer: AudioStructureAnalyzer) -> None:
+    """Install the batch processor's analyzer once per worker process."""
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _analyze_file_in_worker(file_path: str, cache_dir: Optional[str], force: bool) -> Dict:
+    """Process-pool entry point; must stay a picklable module-level function."""
+    return _analyze_file(_worker_analyzer, file_path, cache_dir, force)
+
+
 class BatchProcessor:
-    """Batch processor for audio files."""
+    """Batch processor for audio files.
     
-    def __init__(self, max_workers: int = 4):
+    Analysis is CPU-bound and holds the GIL, so batches run in worker
+    processes by default; backend="thread" keeps everything in-process.
+    Workers are started on the first batch and reused by later ones until
+    close() is called (or the processor is used as a context manager).
+    
+    With the process backend, the analyzer is pickled into each worker when
+    the pool starts, so a custom analyzer must be picklable (an instance of a
+    module-level class holding no open files, locks or sockets). Replacing
+    self.analyzer after the first batch has no effect until close().
+    
+    Workers only analyze; results from a batch are saved to storage by a
+    single writer thread, and a job is marked completed once its result
+    has been saved.
+    """
+    
+    def __init__(self, max_workers: int = 4, backend: str = "process", cache_dir: Optional[str] = None):
+        if backend not in ("process", "thread"):
+            raise ValueError(f"Unknown batch backend: {backend}")
         self.max_workers = max_workers
+        self.backend = backend
+        self.cache_dir = str(cache_dir) if cache_dir is not None else None
         self.jobs: Dict[str, ProcessingJob] = {}
+        # Job ids per status; dicts rather than sets keep insertion order
+        self._by_status: Dict[JobStatus, Dict[str, None]] = {status: {} for status in JobStatus}
+        # Guards jobs, _by_status and job state; the writer thread updates them
+        # while callers may be reading stats
+        self._status_lock = threading.Lock()
         self.storage = StorageManager()
         self.analyzer = AudioStructureAnalyzer()
         self._job_counter = 0
+        self._executor: Optional[Executor] = None
+        self._write_q: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+    
+    def __enter__(self) -> "BatchProcessor":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Wait for running work and shut the worker pool and writer down."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._writer is not None:
+            self._write_q.put(None)
+            self._writer.join()
+            self._writer = None
+    
+    def _get_executor(self) -> Executor:
+        """Get the worker pool, starting it on first use."""
+        if self._executor is None:
+            if self.backend == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.analyzer,)
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+    
+    def _queue_save(self, job: ProcessingJob, result: Dict) -> None:
+        """Hand a job's result to the writer thread, starting it on first use."""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._writer_loop, name="batch-result-writer", daemon=True)
+            self._writer.start()
+        self._write_q.put((job, result))
+    
+    def _writer_loop(self) -> None:
+        """Save queued results one at a time until close() sends None."""
+        while True:
+            item = self._write_q.get()
+            try:
+                if item is None:
+                    return
+                job, result = item
+                try:
+                    self.storage.save_analysis_result(os.path.basename(job.file_path), result)
+                    self._complete_job(job, result)
+                except Exception as e:
+                    self._fail_job(job, e)
+            finally:
+                self._write_q.task_done()
     
     def add_job(self, file_path: str) -> str:
         """Add a processing job to the queue."""
         self._job_counter += 1
-        job_id = f"job_{self._job_counter}_{int(time.time())}"
+        created_at = time.time()
+        job_id = f"job_{self._job_counter}_{int(created_at)}"
         
         job = ProcessingJob(
             id=job_id,
-            file_path=file_path
+            file_path=file_path,
+            created_at=created_at
         )
         
-        self.jobs[job_id] = job
+        with self._status_lock:
+            self.jobs[job_id] = job
+            self._by_status[job.status][job_id] = None
         logger.info(f"Added job {job_id} for file {file_path}")
         return job_id
     
@@ -78,84 +316,166 @@ class BatchProcessor:
     
     def get_pending_jobs(self) -> List[ProcessingJob]:
         """Get all pending jobs."""
-        return [job for job in self.jobs.values() if job.status == JobStatus.PENDING]
+        with self._status_lock:
+            return [self.jobs[job_id] for job_id in self._by_status[JobStatus.PENDING]]
     
     def get_job_status(self, job_id: str) -> Optional[JobStatus]:
         """Get job status."""
         job = self.jobs.get(job_id)
         return job.status if job else None
     
-    def process_job(self, job: ProcessingJob) -> ProcessingJob:
-        """Process a single job."""
-        logger.info(f"Starting job {job.id} for file {job.file_path}")
+    def _set_status(self, job: ProcessingJob, status: JobStatus) -> None:
+        """Change a job's status, keeping the status index in sync.
         
-        job.status = JobStatus.RUNNING
-        job.started_at = time.time()
+        The caller must hold _status_lock.
+        """
+        self._by_status[job.status].pop(job.id, None)
+        job.status = status
+        self._by_status[status][job.id] = None
+    
+    def _start_job(self, job: ProcessingJob) -> None:
+        """Mark a job as running."""
+        logger.info(f"Starting job {job.id} for file {job.file_path}")
         
-        try:
-            # Check if file exists
-            if not Path(job.file_path).exists():
-                raise FileNotFoundError(f"File not found: {job.file_path}")
-            
-            # Analyze the file
-            result = self.analyzer.analyze_structure(
-                job.file_path, 
-                perform_separation=False
-            )
-            
-            # Save result to storage
-            filename = Path(job.file_path).name
-            self.storage.save_analysis_result(filename, result)
-            
-            # Update job
+        with self._status_lock:
+            self._set_status(job, JobStatus.RUNNING)
+            job.started_at = time.time()
+    
+    def _complete_job(self, job: ProcessingJob, result: Dict) -> None:
+        """Record a job's analysis result."""
+        with self._status_lock:
             job.result = result
-            job.status = JobStatus.COMPLETED
             job.completed_at = time.time()
-            
-            logger.info(f"Completed job {job.id} in {job.completed_at - job.started_at:.2f}s")
-            
-        except Exception as e:
-            job.status = JobStatus.FAILED
-            job.error = str(e)
+            self._set_status(job, JobStatus.COMPLETED)
+        
+        logger.info(f"Completed job {job.id} in {job.completed_at - job.started_at:.2f}s")
+    
+    def _fail_job(self, job: ProcessingJob, error: Exception) -> None:
+        """Record a job's failure."""
+        with self._status_lock:
+            job.error = str(error)
             job.completed_at = time.time()
-            
-            logger.error(f"Job {job.id} failed: {e}")
+            self._set_status(job, JobStatus.FAILED)
         
-        return job
+        logger.error(f"Job {job.id} failed: {error}")
     
-    def process_batch(self, job_ids: Optional[List[str]] = None) -> Dict[str, ProcessingJob]:
-        """Process a batch of jobs in parallel."""
+    def _select_jobs(self, job_ids: Optional[List[str]]) -> List[ProcessingJob]:
+        """Get the jobs for a batch, grouped by directory.
+        
+        Submitting files from the same directory back to back keeps reads
+        sequential on disk; the stable sort keeps each directory's job order.
+        """
         if job_ids is None:
-            jobs_to_process = self.get_pending_jobs()
+            jobs = self.get_pending_jobs()
         else:
-            jobs_to_process = [self.jobs[jid] for jid in job_ids if jid in self.jobs]
+            with self._status_lock:
+                jobs = [self.jobs[jid] for jid in job_ids if jid in self.jobs]
+        
+        jobs.sort(key=lambda job: os.path.dirname(job.file_path))
+        return jobs
+    
+    def process_job(self, job: ProcessingJob, force: bool = False) -> ProcessingJob:
+        """Process a single job, reanalyzing cached files when force is set."""
+        self._start_job(job)
+        
+        try:
+            result = _analyze_file(self.analyzer, job.file_path, self.cache_dir, force)
+            self.storage.save_analysis_result(os.path.basename(job.file_path), result)
+            self._complete_job(job, result)
+        except Exception as e:
+            self._fail_job(job, e)
+        
+        return job
+    
+    def process_batch(self, job_ids: Optional[List[str]] = None, force: bool = False) -> Dict[str, ProcessingJob]:
+        """Process a batch of jobs in parallel, reanalyzing cached files when force is set."""
+        jobs_to_process = self._select_jobs(job_ids)
         
         if not jobs_to_process:
             logger.info("No jobs to process")
             return {}
         
-        logger.info(f"Processing {len(jobs_to_process)} jobs with {self.max_workers} workers")
+        logger.info(f"Processing {len(jobs_to_process)} jobs with {self.max_workers} {self.backend} workers")
         
         results = {}
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all jobs
-            future_to_job = {
-                executor.submit(self.process_job, job): job 
-                for job in jobs_to_process
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_job):
+        jobs_to_process = self._fail_missing_files(jobs_to_process, results)
+        future_to_job = self._submit_jobs(jobs_to_process, force)
+        
+        for future in as_completed(future_to_job):
+            job = future_to_job[future]
+            self._finish_analysis(job, future)
+            results[job.id] = job
+        
+        # Jobs are completed by the writer once their results are saved
+        self._write_q.join()
+        return results
+    
+    def _fail_missing_files(self, jobs: List[ProcessingJob], results: Dict[str, ProcessingJob]) -> List[ProcessingJob]:
+        """Fail jobs whose file is missing before any work is submitted.
+        
+        Failed jobs are added to results; the jobs that still exist are returned.
+        """
+        existing = []
+        for job in jobs:
+            if os.path.exists(job.file_path):
+                existing.append(job)
+            else:
+                self._start_job(job)
+                self._fail_job(job, FileNotFoundError(f"File not found: {job.file_path}"))
+                results[job.id] = job
+        return existing
+    
+    def _submit_jobs(self, jobs_to_process: List[ProcessingJob], force: bool) -> Dict[Future, ProcessingJob]:
+        """Start jobs and submit their analysis to the worker pool."""
+        executor = self._get_executor()
+        
+        future_to_job = {}
+        for job in jobs_to_process:
+            self._start_job(job)
+            if self.backend == "process":
+                future = executor.submit(_analyze_file_in_worker, job.file_path, self.cache_dir, force)
+            else:
+                future = executor.submit(_analyze_file, self.analyzer, job.file_path, self.cache_dir, force)
+            future_to_job[future] = job
+        return future_to_job
+    
+    def _finish_analysis(self, job: ProcessingJob, future: Future) -> None:
+        """Queue a finished analysis for saving, or fail its job."""
+        try:
+            result = future.result()
+        except Exception as e:
+            self._fail_job(job, e)
+        else:
+            self._queue_save(job, result)
+    
+    async def process_batch_async(self, job_ids: Optional[List[str]] = None, force: bool = False) -> Dict[str, ProcessingJob]:
+        """Process a batch of jobs without blocking the running event loop.
+        
+        Jobs go to the same worker pool and writer thread as process_batch;
+        the caller's loop only awaits their futures.
+        """
+        jobs_to_process = self._select_jobs(job_ids)
+        
+        if not jobs_to_process:
+            logger.info("No jobs to process")
+            return {}
+        
+        results = {}
+        jobs_to_process = self._fail_missing_files(jobs_to_process, results)
+        future_to_job = {
+            asyncio.wrap_future(future): job
+            for future, job in self._submit_jobs(jobs_to_process, force).items()
+        }
+        
+        pending = set(future_to_job)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
                 job = future_to_job[future]
-                try:
-                    completed_job = future.result()
-                    results[completed_job.id] = completed_job
-                except Exception as e:
-                    logger.error(f"Job {job.id} raised an exception: {e}")
-                    job.status = JobStatus.FAILED
-                    job.error = str(e)
-                    results[job.id] = job
+                self._finish_analysis(job, future)
+                results[job.id] = job
         
+        await asyncio.get_running_loop().run_in_executor(None, self._write_q.join)
         return results
     
     def process_all_pending(self) -> Dict[str, ProcessingJob]:
@@ -164,40 +484,91 @@ class BatchProcessor:
     
     def get_stats(self) -> Dict[str, int]:
         """Get processing statistics."""
-        stats = {
-            "total": len(self.jobs),
-            "pending": 0,
-            "running": 0,
-            "completed": 0,
-            "failed": 0
+        with self._status_lock:
+            stats = {"total": len(self.jobs)}
+            stats.update((status.value, len(job_ids)) for status, job_ids in self._by_status.items())
+        return stats
+    
+    def results_columns(self) -> Dict[str, List]:
+        """Get all finished jobs as columns, one entry per job."""
+        # Finished jobs are no longer written to, so only the index needs the lock
+        with self._status_lock:
+            finished = [
+                self.jobs[job_id]
+                for status in (JobStatus.COMPLETED, JobStatus.FAILED)
+                for job_id in self._by_status[status]
+            ]
+        return {
+            "job_id": [job.id for job in finished],
+            "file_path": [job.file_path for job in finished],
+            "status": [job.status.value for job in finished],
+            "processing_time": [job.completed_at - job.started_at for job in finished],
+            "error": [job.error for job in finished],
+            "result": [job.result for job in finished],
         }
+    
+    def write_results_parquet(self, output_path: str) -> int:
+        """Write all finished jobs to a single Parquet file.
         
-        for job in self.jobs.values():
-            stats[job.status.value] += 1
+        Nested analysis results become struct columns, so downstream
+        analytics can read one table instead of a JSON file per track.
         
-        return stats
+        Returns:
+            Number of rows written
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to write Parquet results")
+        
+        columns = self.results_columns()
+        pq.write_table(pa.table(columns), str(output_path))
+        
+        logger.info(f"Wrote {len(columns['job_id'])} job results to {output_path}")
+        return len(columns["job_id"])
+    
+    def clear_cache(self) -> int:
+        """Delete all cached analysis results."""
+        if self.cache_dir is None or not Path(self.cache_dir).exists():
+            return 0
+        
+        cached = list(Path(self.cache_dir).glob("*.json"))
+        for cache_path in cached:
+            cache_path.unlink()
+        
+        logger.info(f"Cleared {len(cached)} cached analysis results")
+        return len(cached)
     
     def clear_completed_jobs(self) -> int:
         """Clear completed and failed jobs."""
-        to_remove = [
-            job_id for job_id, job in self.jobs.items() 
-            if job.status in [JobStatus.COMPLETED, JobStatus.FAILED]
-        ]
-        
-        for job_id in to_remove:
-            del self.jobs[job_id]
+        removed = 0
+        with self._status_lock:
+            for status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                for job_id in self._by_status[status]:
+                    del self.jobs[job_id]
+                removed += len(self._by_status[status])
+                self._by_status[status].clear()
         
-        logger.info(f"Cleared {len(to_remove)} completed/failed jobs")
-        return len(to_remove)
+        logger.info(f"Cleared {removed} completed/failed jobs")
+        return removed
 
 
 class FileProcessor:
     """High-level file processor with directory scanning."""
     
-    def __init__(self, max_workers: int = 4):
-        self.batch_processor = BatchProcessor(max_workers)
+    def __init__(self, max_workers: int = 4, backend: str = "process", cache_dir: Optional[str] = None):
+        self.batch_processor = BatchProcessor(max_workers, backend, cache_dir)
         self.supported_extensions = ['.wav', '.mp3', '.flac', '.ogg', '.m4a']
     
+    @property
+    def supported_extensions(self) -> Tuple[str, ...]:
+        """Extensions scanned for, e.g. ".wav"; assign a new sequence to change them."""
+        return self._supported_extensions
+    
+    @supported_extensions.setter
+    def supported_extensions(self, extensions: Iterable[str]) -> None:
+        # A tuple cannot be changed in place, so the lookup set never goes stale
+        self._supported_extensions = tuple(extensions)
+        self._ext_set = frozenset(ext.lstrip('.') for ext in self._supported_extensions)
+    
     def scan_directory(self, directory: str, recursive: bool = True) -> List[str]:
         """Scan directory for audio files."""
         directory_path = Path(directory)
@@ -205,15 +576,19 @@ class FileProcessor:
             raise FileNotFoundError(f"Directory not found: {directory}")
         
         audio_files = []
+        ext_set = self._ext_set
+        pending = deque([str(directory_path)])
         
-        if recursive:
-            pattern = "**/*"
-        else:
-            pattern = "*"
-        
-        for file_path in directory_path.glob(pattern):
-            if file_path.is_file() and file_path.suffix.lower() in self.supported_extensions:
-                audio_files.append(str(file_path))
+        # os.scandir reuses the directory listing's file types, so only
+        # entries with a supported extension need an is_file() check
+        while pending:
+            with os.scandir(pending.popleft()) as entries:
+                for entry in entries:
+                    stem, _, ext = entry.name.rpartition('.')
+                    if stem and ext.lower() in ext_set and entry.is_file():
+                        audio_files.append(entry.path)
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
         
         logger.info(f"Found {len(audio_files)} audio files in {directory}")
         return audio_files
@@ -240,17 +615,30 @@ class FileProcessor:
     def get_stats(self) -> Dict[str, int]:
         """Get processing statistics."""
         return self.batch_processor.get_stats()
+    
+    def close(self) -> None:
+        """Shut down the batch processor's workers."""
+        self.batch_processor.close()
+    
+    def __enter__(self) -> "FileProcessor":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
 
 
 def create_progress_callback(total_jobs: int) -> Callable[[ProcessingJob], None]:
     """Create a progress callback function."""
-    completed = {"count": 0}
+    # next() on itertools.count is atomic in CPython, so no lock is needed
+    finished = itertools.count(1)
     
     def callback(job: ProcessingJob):
-        if job.status in [JobStatus.COMPLETED, JobStatus.FAILED]:
-            completed["count"] += 1
-            progress = (completed["count"] / total_jobs) * 100
-            status_emoji = "✅" if job.status == JobStatus.COMPLETED else "❌"
-            logger.info(f"{status_emoji} {job.id}: {progress:.1f}% complete ({completed['count']}/{total_jobs})")
+        if job.status not in (JobStatus.COMPLETED, JobStatus.FAILED):
+            return
+        count = next(finished)
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        status_emoji = "✅" if job.status == JobStatus.COMPLETED else "❌"
+        logger.info(_PROGRESS_MESSAGE, status_emoji, job.id, count / total_jobs * 100, count, total_jobs)
     
     return callback
\ No newline at end of file
@@ -6,21 +6,27 @@ and MIDI files with maximum data extraction before any deletions occur.
 Optimized for agentic AI-bandmate training data generation.
 """
 
+import importlib.util
+import io
+import json
 import logging
+import os
 import time
-from datetime import datetime
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import cached_property
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Tuple, Any
+from typing import Dict, List, Optional, Set, Union, Tuple, Any
 import tempfile
 import shutil
 
 import numpy as np
-try:
-    import librosa
-    LIBROSA_AVAILABLE = True
-except ImportError:
-    LIBROSA_AVAILABLE = False
-    logger.warning("librosa not available - using mock audio processing")
+
+# librosa is only imported once audio is processed, so MIDI-only runs never
+# pay for it; here we just check that it is installed
+LIBROSA_AVAILABLE = importlib.util.find_spec("librosa") is not None
 
 try:
     import pretty_midi
@@ -47,14 +53,86 @@ from ..agents.channel_mapping import (
     map_audio_stem_to_channel,
     create_agent_midi_template
 )
-from ..audio.features import FeatureExtractor
-from ..audio.separation import StemSeparator
 from ..midi.converter import AudioToMIDIConverter
 from ..core.config import RootzEngineConfig
 from ..core.exceptions import RootzEngineError, AudioProcessingError
 
 logger = logging.getLogger(__name__)
 
+# Spectrotone primary color and timbre per instrument
+_COLOR_MAP = {
+    'bass': 'blue',
+    'guitar': 'tan',
+    'drums': 'white',
+    'organ': 'ivory',
+    'piano': 'white'
+}
+_TIMBRE_MAP = {
+    'bass': 'dark',
+    'guitar': 'warm',
+    'drums': 'percussive',
+    'organ': 'hollow',
+    'piano': 'neutral'
+}
+
+
+def _extract_stem_features(audio_config, stem_path: str) -> Dict:
+    """Extract features from one stem file.
+    
+    Process-pool entry point: it must stay a picklable module-level function,
+    and it builds its own FeatureExtractor so each worker keeps its own
+    librosa state.
+    """
+    from ..audio.features import FeatureExtractor
+    return FeatureExtractor(audio_config).extract_all_features(stem_path)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Hard-link target to source, copying where links are unsupported."""
+    if target.exists():
+        target.unlink()
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def _write_atomic(path: Path, data: bytes) -> Path:
+    """Write a file through a temporary name so readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _midi_bytes(midi_data: "pretty_midi.PrettyMIDI") -> bytes:
+    """Encode a PrettyMIDI object as .mid file contents in memory."""
+    buffer = io.BytesIO()
+    midi_data.write(buffer)
+    return buffer.getvalue()
+
+
+def _notes_to_arrays(notes: List) -> Tuple[np.ndarray, np.ndarray]:
+    """Get (pitches, velocities) uint8 arrays from one pass over a note list."""
+    fields = np.array([(note.pitch, note.velocity) for note in notes], dtype=np.uint8).reshape(-1, 2)
+    return fields[:, 0], fields[:, 1]
+
+
+def _envelope_to_velocity(onset_env: np.ndarray, beats: np.ndarray) -> np.ndarray:
+    """Map the onset-envelope peak within each beat to a 1-127 MIDI velocity.
+    
+    Peaks are log-scaled against the loudest beat; one reduceat pass finds
+    every beat's peak without slicing the envelope per beat.
+    """
+    beats = np.unique(beats[(beats >= 0) & (beats < len(onset_env))])
+    if len(beats) == 0:
+        return np.empty(0, dtype=np.uint8)
+    peaks = np.log1p(np.maximum.reduceat(onset_env, beats))
+    loudest = peaks.max()
+    if loudest <= 0:
+        return np.ones(len(peaks), dtype=np.uint8)
+    return (1 + np.rint(peaks * (126 / loudest))).astype(np.uint8)
+
 
 class ProcessingResult:
     """Result from processing pipeline with all extracted data."""
@@ -79,22 +157,42 @@ class ProcessingResult:
         # Cleanup tracking
         self.temp_files: List[str] = []
         self.stems_deleted = False
+        
+        # "name:status:seconds" per stage, logged once when processing ends
+        self.stages: List[str] = []
 
 
 class UnifiedProcessingPipeline:
     """
     Unified pipeline for processing both audio and MIDI files with
     maximum extraction efficiency for AI bandmate training.
+    
+    Per-stem analysis runs in a worker-process pool that is started on the
+    first audio file and reused for later ones. Call close() (or use the
+    pipeline as a context manager) to shut it down; otherwise it is shut
+    down when the pipeline is garbage collected or the interpreter exits.
     """
     
+    # "processed" output directories known to exist in this process; an entry
+    # is dropped again if its directory turns out to have been removed
+    _processed_dirs: Set[Path] = set()
+    
     def __init__(self, config: Optional[RootzEngineConfig] = None):
         """Initialize the processing pipeline."""
         self.config = config or RootzEngineConfig()
         self.channel_mapping = get_channel_mapping()
         
-        # Initialize processors
-        self.feature_extractor = FeatureExtractor(self.config.audio)
-        self.stem_separator = StemSeparator(self.config.audio)
+        # MIDI program -> standardized channel, built once per pipeline
+        self._program_channels = {
+            32: self.channel_mapping.BASS_CHANNEL,      # Acoustic Bass
+            33: self.channel_mapping.BASS_CHANNEL,      # Electric Bass
+            25: self.channel_mapping.RHYTHM_GUITAR_CHANNEL,  # Acoustic Guitar
+            27: self.channel_mapping.RHYTHM_GUITAR_CHANNEL,  # Electric Guitar
+            16: self.channel_mapping.ORGAN_CHANNEL,     # Organ
+            0: self.channel_mapping.PIANO_CHANNEL       # Piano
+        }
+        
+        self._rng = np.random.default_rng()
         
         # Processing thresholds
         self.ACCURACY_THRESHOLD = 0.85  # 85% accuracy for keeping MIDI
@@ -102,6 +200,38 @@ class UnifiedProcessingPipeline:
         
         logger.info("Initialized UnifiedProcessingPipeline")
     
+    @cached_property
+    def feature_extractor(self):
+        """Audio feature extractor, created (and librosa imported) on first use."""
+        from ..audio.features import FeatureExtractor
+        return FeatureExtractor(self.config.audio)
+    
+    @cached_property
+    def stem_separator(self):
+        """Stem separator, created on first use."""
+        from ..audio.separation import StemSeparator
+        return StemSeparator(self.config.audio)
+    
+    @cached_property
+    def _stem_executor(self) -> ProcessPoolExecutor:
+        """Worker pool for per-stem analysis, started on first use and reused across files."""
+        executor = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+        # Shuts the pool down even if close() is never called; the callback
+        # holds the executor, not the pipeline
+        self._stem_executor_finalizer = weakref.finalize(self, executor.shutdown)
+        return executor
+    
+    def close(self) -> None:
+        """Shut down the per-stem worker pool, if it was started."""
+        if self.__dict__.pop("_stem_executor", None) is not None:
+            self._stem_executor_finalizer()
+    
+    def __enter__(self) -> "UnifiedProcessingPipeline":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     def process_file(self, input_file: Union[str, Path]) -> ProcessingResult:
         """
         Process a file (audio or MIDI) with maximum extraction efficiency.
@@ -116,7 +246,7 @@ class UnifiedProcessingPipeline:
         result = ProcessingResult(str(input_path))
         
         try:
-            logger.info(f"Starting processing: {input_path.name}")
+            logger.debug("Starting processing: %s", input_path.name)
             
             # Detect file type and route to appropriate processor
             if input_path.suffix.lower() in ['.mp3', '.wav', '.flac', '.aac']:
@@ -139,7 +269,12 @@ class UnifiedProcessingPipeline:
             )
             result.success = True
             
-            logger.info(f"Processing completed successfully: {input_path.name}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("processed %s", json.dumps({
+                    "file": input_path.name,
+                    "stages": result.stages,
+                    "validation_passed": result.validation_passed,
+                }))
             
         except Exception as e:
             error_msg = f"Processing failed for {input_path.name}: {str(e)}"
@@ -157,224 +292,171 @@ class UnifiedProcessingPipeline:
         
         return result
     
+    @contextmanager
+    def _stage(self, result: ProcessingResult, stage_name: str, **metrics):
+        """Time a processing stage and record it when its body succeeds.
+        
+        The body may update the yielded metrics (e.g. a status or score only
+        known at the end); if it raises, only the per-file stage summary
+        notes the failure.
+        """
+        metrics.setdefault("status", ProcessingStatus.COMPLETED)
+        start_time = datetime.now()
+        stage_start = time.perf_counter()
+        try:
+            yield metrics
+        except Exception:
+            result.stages.append(f"{stage_name}:failed:{time.perf_counter() - stage_start:.2f}")
+            raise
+        duration = time.perf_counter() - stage_start
+        result.stages.append(f"{stage_name}:{metrics['status'].value}:{duration:.2f}")
+        
+        result.metadata.add_processing_stage(ProcessingMetrics(
+            stage_name=stage_name,
+            start_time=start_time,
+            end_time=start_time + timedelta(seconds=duration),
+            duration_seconds=duration,
+            **metrics
+        ))
+    
     def _process_audio_file(self, audio_path: Path, result: ProcessingResult):
         """Process audio file with maximum extraction efficiency."""
-        logger.info(f"Processing audio file: {audio_path.name}")
+        logger.debug("Processing audio file: %s", audio_path.name)
         
         # Stage 1: Audio Feature Extraction (most comprehensive first)
-        stage_start = time.time()
         try:
-            logger.info("Stage 1: Comprehensive audio feature extraction")
-            result.audio_features = self.feature_extractor.extract_all_features(str(audio_path))
-            
-            result.metadata.add_processing_stage(ProcessingMetrics(
-                stage_name="audio_feature_extraction",
-                status=ProcessingStatus.COMPLETED,
-                start_time=datetime.now(),
-                end_time=datetime.now(),
-                duration_seconds=time.time() - stage_start,
-                confidence_score=0.9
-            ))
-            
+            with self._stage(result, "audio_feature_extraction", confidence_score=0.9):
+                logger.debug("Stage 1: Comprehensive audio feature extraction")
+                # Decode once; stem separation reuses the same samples
+                y, sr = self.feature_extractor.load_audio(str(audio_path))
+                result.audio_features = self.feature_extractor.extract_all_features_from_array(y, sr)
+        
         except Exception as e:
             raise AudioProcessingError(f"Audio feature extraction failed: {str(e)}")
         
         # Stage 2: Spectrotone Analysis (before stem separation)
-        stage_start = time.time()
         try:
-            logger.info("Stage 2: Spectrotone analysis")
-            spectrotone_data = self._extract_spectrotone_analysis(
-                str(audio_path), result.audio_features
-            )
-            result.spectrotone_data = spectrotone_data
-            
-            result.metadata.add_processing_stage(ProcessingMetrics(
-                stage_name="spectrotone_analysis",
-                status=ProcessingStatus.COMPLETED,
-                start_time=datetime.now(),
-                end_time=datetime.now(),
-                duration_seconds=time.time() - stage_start
-            ))
-            
+            with self._stage(result, "spectrotone_analysis"):
+                logger.debug("Stage 2: Spectrotone analysis")
+                spectrotone_data = self._extract_spectrotone_analysis(
+                    str(audio_path), result.audio_features
+                )
+                result.spectrotone_data = spectrotone_data
+        
         except Exception as e:
             logger.warning(f"Spectrotone analysis failed: {str(e)}")
         
         # Stage 3: Stem Separation (expensive operation)
-        stage_start = time.time()
         try:
-            logger.info("Stage 3: Audio stem separation")
-            stems = self._separate_audio_stems(audio_path, result)
-            result.stems = stems
-            
-            result.metadata.add_processing_stage(ProcessingMetrics(
-                stage_name="stem_separation",
-                status=ProcessingStatus.COMPLETED,
-                start_time=datetime.now(),
-                end_time=datetime.now(),
-                duration_seconds=time.time() - stage_start,
-                confidence_score=0.8
-            ))
-            
+            with self._stage(result, "stem_separation", confidence_score=0.8):
+                logger.debug("Stage 3: Audio stem separation")
+                stems = self._separate_audio_stems(audio_path, result, y, sr)
+                result.stems = stems
+        
         except Exception as e:
             logger.warning(f"Stem separation failed: {str(e)}")
             # Continue without stems
         
         # Stage 4: Per-Stem Analysis (extract everything from each stem)
         if result.stems:
-            stage_start = time.time()
             try:
-                logger.info("Stage 4: Per-stem deep analysis")
-                self._analyze_individual_stems(result)
-                
-                result.metadata.add_processing_stage(ProcessingMetrics(
-                    stage_name="per_stem_analysis", 
-                    status=ProcessingStatus.COMPLETED,
-                    start_time=datetime.now(),
-                    end_time=datetime.now(),
-                    duration_seconds=time.time() - stage_start
-                ))
-                
+                with self._stage(result, "per_stem_analysis"):
+                    logger.debug("Stage 4: Per-stem deep analysis")
+                    self._analyze_individual_stems(result)
+            
             except Exception as e:
                 logger.warning(f"Per-stem analysis failed: {str(e)}")
         
         # Stage 5: MIDI Conversion with Accuracy Validation
-        stage_start = time.time()
         try:
-            logger.info("Stage 5: MIDI conversion with validation")
-            midi_result = self._convert_to_midi_with_validation(result)
-            result.midi_data = midi_result['midi_data']
-            result.midi_file_path = midi_result['midi_path']
-            result.midi_accuracy_score = midi_result['accuracy_score']
-            result.validation_passed = midi_result['accuracy_score'] >= self.ACCURACY_THRESHOLD
-            
-            result.metadata.add_processing_stage(ProcessingMetrics(
-                stage_name="midi_conversion",
-                status=ProcessingStatus.VALIDATED if result.validation_passed else ProcessingStatus.COMPLETED,
-                start_time=datetime.now(),
-                end_time=datetime.now(), 
-                duration_seconds=time.time() - stage_start,
-                accuracy_score=result.midi_accuracy_score
-            ))
-            
+            with self._stage(result, "midi_conversion") as stage:
+                logger.debug("Stage 5: MIDI conversion with validation")
+                midi_result = self._convert_to_midi_with_validation(result)
+                result.midi_data = midi_result['midi_data']
+                result.midi_file_path = midi_result['midi_path']
+                result.midi_accuracy_score = midi_result['accuracy_score']
+                result.validation_passed = midi_result['accuracy_score'] >= self.ACCURACY_THRESHOLD
+                stage["status"] = ProcessingStatus.VALIDATED if result.validation_passed else ProcessingStatus.COMPLETED
+                stage["accuracy_score"] = result.midi_accuracy_score
+        
         except Exception as e:
             logger.warning(f"MIDI conversion failed: {str(e)}")
         
         # Stage 6: Cross-Instrument Interaction Analysis
-        stage_start = time.time()
         try:
-            logger.info("Stage 6: Cross-instrument interaction analysis")
-            self._analyze_cross_instrument_interactions(result)
-            
-            result.metadata.add_processing_stage(ProcessingMetrics(
-                stage_name="interaction_analysis",
-                status=ProcessingStatus.COMPLETED,
-                start_time=datetime.now(),
-                end_time=datetime.now(),
-                duration_seconds=time.time() - stage_start
-            ))
-            
+            with self._stage(result, "interaction_analysis"):
+                logger.debug("Stage 6: Cross-instrument interaction analysis")
+                self._analyze_cross_instrument_interactions(result)
+        
         except Exception as e:
             logger.warning(f"Interaction analysis failed: {str(e)}")
         
         # Stage 7: Cleanup (delete stems if MIDI validation passed)
         if result.validation_passed and result.stems:
-            logger.info("Stage 7: Cleaning up audio stems (validation passed)")
+            logger.debug("Stage 7: Cleaning up audio stems (validation passed)")
             self._cleanup_audio_stems(result)
             result.stems_deleted = True
         else:
-            logger.info("Keeping audio stems (validation did not pass threshold)")
+            logger.debug("Keeping audio stems (validation did not pass threshold)")
     
     def _process_midi_file(self, midi_path: Path, result: ProcessingResult):
         """Process MIDI file with comprehensive analysis."""
-        logger.info(f"Processing MIDI file: {midi_path.name}")
+        logger.debug("Processing MIDI file: %s", midi_path.name)
         
         # Stage 1: MIDI Loading and Basic Analysis
-        stage_start = time.time()
         try:
-            logger.info("Stage 1: MIDI loading and basic analysis")
-            result.midi_data = pretty_midi.PrettyMIDI(str(midi_path))
-            result.midi_file_path = str(midi_path)
-            
-            # Add file reference
-            result.metadata.add_file_reference("original_midi", FileReference(
-                file_id=result.metadata.file_id,
-                file_type=FileType.MIDI,
-                file_path=str(midi_path),
-                file_size=midi_path.stat().st_size
-            ))
-            
-            result.metadata.add_processing_stage(ProcessingMetrics(
-                stage_name="midi_loading",
-                status=ProcessingStatus.COMPLETED,
-                start_time=datetime.now(),
-                end_time=datetime.now(),
-                duration_seconds=time.time() - stage_start
-            ))
-            
+            with self._stage(result, "midi_loading"):
+                logger.debug("Stage 1: MIDI loading and basic analysis")
+                result.midi_data = pretty_midi.PrettyMIDI(str(midi_path))
+                result.midi_file_path = str(midi_path)
+                
+                # Add file reference
+                result.metadata.add_file_reference("original_midi", FileReference(
+                    file_id=result.metadata.file_id,
+                    file_type=FileType.MIDI,
+                    file_path=str(midi_path),
+                    file_size=midi_path.stat().st_size
+                ))
+        
         except Exception as e:
             raise RootzEngineError(f"MIDI loading failed: {str(e)}")
         
         # Stage 2: MIDI Quality Analysis
-        stage_start = time.time()
         try:
-            logger.info("Stage 2: MIDI quality analysis")
-            quality_score = self._analyze_midi_quality(result.midi_data)
-            
-            result.metadata.add_processing_stage(ProcessingMetrics(
-                stage_name="midi_quality_analysis",
-                status=ProcessingStatus.COMPLETED,
-                start_time=datetime.now(),
-                end_time=datetime.now(),
-                duration_seconds=time.time() - stage_start,
-                confidence_score=quality_score
-            ))
-            
+            with self._stage(result, "midi_quality_analysis") as stage:
+                logger.debug("Stage 2: MIDI quality analysis")
+                quality_score = self._analyze_midi_quality(result.midi_data)
+                stage["confidence_score"] = quality_score
+        
         except Exception as e:
             logger.warning(f"MIDI quality analysis failed: {str(e)}")
         
         # Stage 3: Per-Channel Analysis
-        stage_start = time.time()
         try:
-            logger.info("Stage 3: Per-channel MIDI analysis")
-            self._analyze_midi_channels(result)
-            
-            result.metadata.add_processing_stage(ProcessingMetrics(
-                stage_name="midi_channel_analysis",
-                status=ProcessingStatus.COMPLETED,
-                start_time=datetime.now(),
-                end_time=datetime.now(),
-                duration_seconds=time.time() - stage_start
-            ))
-            
+            with self._stage(result, "midi_channel_analysis"):
+                logger.debug("Stage 3: Per-channel MIDI analysis")
+                self._analyze_midi_channels(result)
+        
         except Exception as e:
             logger.warning(f"MIDI channel analysis failed: {str(e)}")
         
         # Stage 4: MIDI Standardization (channel mapping)
-        stage_start = time.time()
         try:
-            logger.info("Stage 4: MIDI standardization")
-            standardized_midi = self._standardize_midi_channels(result.midi_data)
-            
-            # Save standardized MIDI
-            output_dir = Path(result.metadata.source_file).parent / "processed"
-            output_dir.mkdir(exist_ok=True)
-            standardized_path = output_dir / f"{midi_path.stem}_standardized.mid"
-            standardized_midi.write(str(standardized_path))
-            
-            result.metadata.add_file_reference("standardized_midi", FileReference(
-                file_id=result.metadata.file_id + "_std",
-                file_type=FileType.MIDI_CONVERTED,
-                file_path=str(standardized_path)
-            ))
-            
-            result.metadata.add_processing_stage(ProcessingMetrics(
-                stage_name="midi_standardization",
-                status=ProcessingStatus.COMPLETED,
-                start_time=datetime.now(),
-                end_time=datetime.now(),
-                duration_seconds=time.time() - stage_start
-            ))
-            
+            with self._stage(result, "midi_standardization"):
+                logger.debug("Stage 4: MIDI standardization")
+                standardized_midi = self._standardize_midi_channels(result.midi_data)
+                
+                # Save standardized MIDI
+                standardized_path = self._write_processed(
+                    result, f"{midi_path.stem}_standardized.mid", _midi_bytes(standardized_midi)
+                )
+                
+                result.metadata.add_file_reference("standardized_midi", FileReference(
+                    file_id=result.metadata.file_id + "_std",
+                    file_type=FileType.MIDI_CONVERTED,
+                    file_path=str(standardized_path)
+                ))
+        
         except Exception as e:
             logger.warning(f"MIDI standardization failed: {str(e)}")
         
@@ -382,24 +464,57 @@ class UnifiedProcessingPipeline:
         result.midi_accuracy_score = 1.0
         result.validation_passed = True
     
-    def _separate_audio_stems(self, audio_path: Path, result: ProcessingResult) -> Dict[str, str]:
-        """Separate audio into stems and return file paths."""
+    def _processed_dir(self, result: ProcessingResult) -> Path:
+        """Get the "processed" directory next to the source file, creating it on first use."""
+        output_dir = Path(result.metadata.source_file).parent / "processed"
+        if output_dir not in self._processed_dirs:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._processed_dirs.add(output_dir)
+        return output_dir
+    
+    def _write_processed(self, result: ProcessingResult, filename: str, data: bytes) -> Path:
+        """Write a file into the processed directory and return its path.
+        
+        If the directory was removed after it was cached as existing, the
+        entry is dropped, the directory re-created and the write retried.
+        """
+        output_dir = self._processed_dir(result)
+        try:
+            return _write_atomic(output_dir / filename, data)
+        except FileNotFoundError:
+            self._processed_dirs.discard(output_dir)
+            return _write_atomic(self._processed_dir(result) / filename, data)
+    
+    def _separate_audio_stems(
+        self,
+        audio_path: Path,
+        result: ProcessingResult,
+        y: np.ndarray,
+        sr: int
+    ) -> Dict[str, str]:
+        """Separate already-decoded audio into stems and return file paths."""
         output_dir = audio_path.parent / "stems" / audio_path.stem
         output_dir.mkdir(parents=True, exist_ok=True)
         
         # Perform stem separation (simplified - would use actual implementation)
         stems = {}
         
-        # Mock separation - in real implementation would use Demucs or similar
-        y, sr = librosa.load(str(audio_path), sr=self.config.audio.sample_rate)
+        import soundfile as sf
         
+        # Mock separation - in real implementation would use Demucs or similar
         # Simulate different stems (in real implementation, these would be actual separated audio)
         stem_names = ['bass', 'drums', 'guitar', 'other']
         
+        first_stem_path = None
         for stem_name in stem_names:
             stem_path = output_dir / f"{stem_name}.wav"
-            # Mock: save the same audio for now (real implementation would have separated audio)
-            librosa.output.write_wav(str(stem_path), y, sr)
+            # Mock: every stem is the same audio for now (real implementation would
+            # have separated audio), so encode it once and link the other stems to it
+            if first_stem_path is None:
+                sf.write(str(stem_path), y, sr, subtype='PCM_16')
+                first_stem_path = stem_path
+            else:
+                _link_or_copy(first_stem_path, stem_path)
             stems[stem_name] = str(stem_path)
             result.temp_files.append(str(stem_path))
             
@@ -420,15 +535,20 @@ class UnifiedProcessingPipeline:
         # Example spectrotone analysis for detected instruments
         detected_instruments = ['bass', 'guitar', 'drums', 'organ']
         
-        for instrument in detected_instruments:
+        # One (brightness, weight, resonance) row per instrument in a single draw
+        samples = self._rng.uniform(
+            low=[0.2, 0.4, 0.3], high=[0.8, 0.9, 0.9], size=(len(detected_instruments), 3)
+        ).tolist()
+        
+        for instrument, (brightness, weight, resonance) in zip(detected_instruments, samples):
             spectrotone_data[instrument] = SpectrotoneAnalysis(
                 instrument=instrument,
                 primary_color=self._get_instrument_color(instrument),
                 secondary_color="grey",
                 timbre=self._get_instrument_timbre(instrument),
-                brightness=np.random.uniform(0.2, 0.8),
-                weight=np.random.uniform(0.4, 0.9), 
-                resonance=np.random.uniform(0.3, 0.9),
+                brightness=brightness,
+                weight=weight,
+                resonance=resonance,
                 harmonic_content={
                     "fundamental": 0.8,
                     "2nd_harmonic": 0.6,
@@ -442,78 +562,91 @@ class UnifiedProcessingPipeline:
     
     def _get_instrument_color(self, instrument: str) -> str:
         """Get primary color for instrument based on spectrotone mapping."""
-        color_map = {
-            'bass': 'blue',
-            'guitar': 'tan', 
-            'drums': 'white',
-            'organ': 'ivory',
-            'piano': 'white'
-        }
-        return color_map.get(instrument, 'grey')
+        return _COLOR_MAP.get(instrument, 'grey')
     
     def _get_instrument_timbre(self, instrument: str) -> str:
         """Get timbre description for instrument."""
-        timbre_map = {
-            'bass': 'dark',
-            'guitar': 'warm',
-            'drums': 'percussive',
-            'organ': 'hollow',
-            'piano': 'neutral'
-        }
-        return timbre_map.get(instrument, 'neutral')
+        return _TIMBRE_MAP.get(instrument, 'neutral')
     
     def _analyze_individual_stems(self, result: ProcessingResult):
-        """Perform deep analysis on each separated stem."""
-        for stem_name, stem_path in result.stems.items():
+        """Perform deep analysis on each separated stem.
+        
+        Stems are independent files, so their feature extraction runs in the
+        pipeline's worker pool; the analyses are then recorded here in stem
+        order. A single stem is analyzed inline, as the pool would only add
+        overhead.
+        """
+        if len(result.stems) < 2:
+            for stem_name, stem_path in result.stems.items():
+                try:
+                    stem_features = self.feature_extractor.extract_all_features(stem_path)
+                    self._record_stem_analysis(result, stem_name, stem_features)
+                except Exception as e:
+                    logger.warning(f"Failed to analyze stem {stem_name}: {str(e)}")
+            return
+        
+        stem_futures = {
+            stem_name: self._stem_executor.submit(_extract_stem_features, self.config.audio, stem_path)
+            for stem_name, stem_path in result.stems.items()
+        }
+        
+        for stem_name, future in stem_futures.items():
             try:
-                # Extract features from individual stem
-                stem_features = self.feature_extractor.extract_all_features(stem_path)
-                
-                # Map stem to MIDI channel
-                channel = map_audio_stem_to_channel(stem_name)
-                if channel is None:
-                    continue
-                
-                # Create instrument analysis
-                instrument_analysis = InstrumentAnalysis(
-                    channel=channel,
-                    instrument=stem_name,
-                    note_range=self._estimate_note_range(stem_features),
-                    velocity_curve=self._extract_velocity_curve(stem_features),
-                    timing_variations=self._analyze_timing_variations(stem_features),
-                    playing_patterns=self._identify_playing_patterns(stem_name, stem_features),
-                    harmonic_function=self._determine_harmonic_function(stem_name),
-                    interaction_patterns={},  # Will be filled in cross-analysis
-                    behavioral_traits=self._extract_behavioral_traits(stem_name, stem_features),
-                    spectrotone=result.spectrotone_data.get(stem_name, SpectrotoneAnalysis(
-                        instrument=stem_name,
-                        primary_color=self._get_instrument_color(stem_name),
-                        secondary_color="grey",
-                        timbre=self._get_instrument_timbre(stem_name),
-                        brightness=0.5,
-                        weight=0.5,
-                        resonance=0.5,
-                        harmonic_content={},
-                        temporal_evolution=[]
-                    )),
-                    midi_events_count=0,  # Will be updated after MIDI conversion
-                    dominant_rhythmic_pattern=self._identify_rhythmic_pattern(stem_features)
-                )
-                
-                result.metadata.add_channel_analysis(channel, instrument_analysis)
-                
+                self._record_stem_analysis(result, stem_name, future.result())
             except Exception as e:
                 logger.warning(f"Failed to analyze stem {stem_name}: {str(e)}")
     
+    def _record_stem_analysis(self, result: ProcessingResult, stem_name: str, stem_features: Dict):
+        """Add the instrument analysis for one stem to the result metadata."""
+        # Map stem to MIDI channel
+        channel = map_audio_stem_to_channel(stem_name)
+        if channel is None:
+            return
+        
+        # Create instrument analysis
+        instrument_analysis = InstrumentAnalysis(
+            channel=channel,
+            instrument=stem_name,
+            note_range=self._estimate_note_range(stem_features),
+            velocity_curve=self._extract_velocity_curve(stem_features),
+            timing_variations=self._analyze_timing_variations(stem_features),
+            playing_patterns=self._identify_playing_patterns(stem_name, stem_features),
+            harmonic_function=self._determine_harmonic_function(stem_name),
+            interaction_patterns={},  # Will be filled in cross-analysis
+            behavioral_traits=self._extract_behavioral_traits(stem_name, stem_features),
+            spectrotone=result.spectrotone_data.get(stem_name, SpectrotoneAnalysis(
+                instrument=stem_name,
+                primary_color=self._get_instrument_color(stem_name),
+                secondary_color="grey",
+                timbre=self._get_instrument_timbre(stem_name),
+                brightness=0.5,
+                weight=0.5,
+                resonance=0.5,
+                harmonic_content={},
+                temporal_evolution=[]
+            )),
+            midi_events_count=0,  # Will be updated after MIDI conversion
+            dominant_rhythmic_pattern=self._identify_rhythmic_pattern(stem_features)
+        )
+        
+        result.metadata.add_channel_analysis(channel, instrument_analysis)
+    
     def _estimate_note_range(self, features: Dict) -> Tuple[int, int]:
         """Estimate MIDI note range from audio features."""
         # Mock implementation - would use pitch detection
         return (40, 80)  # Default range
     
     def _extract_velocity_curve(self, features: Dict) -> List[int]:
-        """Extract velocity curve from audio features."""
-        # Mock implementation - would analyze RMS energy
-        return [64, 72, 68, 75, 70, 80, 65, 77]  # Example velocity curve
+        """Extract a per-beat velocity curve from audio features."""
+        rhythm = features.get("rhythm", {})
+        velocities = _envelope_to_velocity(
+            np.asarray(rhythm.get("onset_strength", []), dtype=np.float32),
+            np.asarray(rhythm.get("beats", []), dtype=np.int64),
+        )
+        if len(velocities) == 0:
+            # No beats tracked - fall back to a typical velocity curve
+            return [64, 72, 68, 75, 70, 80, 65, 77]
+        return velocities.tolist()
     
     def _analyze_timing_variations(self, features: Dict) -> Dict[str, float]:
         """Analyze timing variations in the audio."""
@@ -570,22 +703,19 @@ class UnifiedProcessingPipeline:
             instrument = pretty_midi.Instrument(program=0, is_drum=(channel == 10))
             
             # Add some notes based on analysis
-            for i in range(4):  # 4 quarter notes
-                note = pretty_midi.Note(
-                    velocity=analysis.velocity_curve[0] if analysis.velocity_curve else 64,
-                    pitch=analysis.note_range[0] + 12,  # Root note
-                    start=i * 0.5,
-                    end=(i + 1) * 0.5
-                )
-                instrument.notes.append(note)
+            velocity = analysis.velocity_curve[0] if analysis.velocity_curve else 64
+            pitch = analysis.note_range[0] + 12  # Root note
+            instrument.notes = [
+                pretty_midi.Note(velocity=velocity, pitch=pitch, start=i * 0.5, end=(i + 1) * 0.5)
+                for i in range(4)  # 4 quarter notes
+            ]
             
             midi_data.instruments.append(instrument)
         
         # Save MIDI file
-        output_dir = Path(result.metadata.source_file).parent / "processed"
-        output_dir.mkdir(exist_ok=True)
-        midi_path = output_dir / f"{Path(result.metadata.source_file).stem}_converted.mid"
-        midi_data.write(str(midi_path))
+        midi_path = self._write_processed(
+            result, f"{Path(result.metadata.source_file).stem}_converted.mid", _midi_bytes(midi_data)
+        )
         
         # Add file reference
         result.metadata.add_file_reference("converted_midi", FileReference(
@@ -608,13 +738,20 @@ class UnifiedProcessingPipeline:
         # Mock quality analysis - would implement actual quality metrics
         quality_factors = []
         
-        # Check for realistic velocities
-        all_velocities = []
+        # Check for realistic velocities. Each instrument's velocities are read
+        # once into a histogram; mean and variance then come from its 256 bins.
+        velocity_counts = np.zeros(256, dtype=np.int64)
         for instrument in midi_data.instruments:
-            all_velocities.extend([note.velocity for note in instrument.notes])
+            velocities = np.fromiter(
+                (note.velocity for note in instrument.notes), dtype=np.uint8, count=len(instrument.notes)
+            )
+            velocity_counts += np.bincount(velocities, minlength=256)
         
-        if all_velocities:
-            velocity_variance = np.var(all_velocities)
+        n_notes = velocity_counts.sum()
+        if n_notes:
+            levels = np.arange(256)
+            mean_velocity = levels @ velocity_counts / n_notes
+            velocity_variance = (levels - mean_velocity) ** 2 @ velocity_counts / n_notes
             quality_factors.append(min(velocity_variance / 500.0, 1.0))  # Normalize
         
         # Check for timing humanization
@@ -634,15 +771,14 @@ class UnifiedProcessingPipeline:
                 channel = 10  # Standard drum channel
             
             # Analyze notes
-            velocities = [note.velocity for note in instrument.notes]
-            pitches = [note.pitch for note in instrument.notes]
+            pitches, velocities = _notes_to_arrays(instrument.notes)
             
             # Create analysis
             analysis = InstrumentAnalysis(
                 channel=channel,
                 instrument=f"midi_instrument_{instrument.program}",
-                note_range=(min(pitches), max(pitches)) if pitches else (60, 72),
-                velocity_curve=velocities[:8] if len(velocities) >= 8 else velocities,
+                note_range=(int(pitches.min()), int(pitches.max())),
+                velocity_curve=velocities[:8].tolist(),
                 timing_variations={"average_deviation": 0.01},
                 playing_patterns=["midi_pattern"],
                 harmonic_function="midi_function",
@@ -681,7 +817,8 @@ class UnifiedProcessingPipeline:
                     is_drum=instrument.is_drum,
                     name=f"standardized_{target_channel}"
                 )
-                new_instrument.notes = instrument.notes.copy()
+                # Notes are never modified after loading, so the list is shared, not copied
+                new_instrument.notes = instrument.notes
                 standardized.instruments.append(new_instrument)
         
         return standardized
@@ -692,16 +829,7 @@ class UnifiedProcessingPipeline:
             return self.channel_mapping.DRUMS_FULL_KIT_CHANNEL
         
         # Map based on program number
-        program_map = {
-            32: self.channel_mapping.BASS_CHANNEL,      # Acoustic Bass
-            33: self.channel_mapping.BASS_CHANNEL,      # Electric Bass
-            25: self.channel_mapping.RHYTHM_GUITAR_CHANNEL,  # Acoustic Guitar
-            27: self.channel_mapping.RHYTHM_GUITAR_CHANNEL,  # Electric Guitar
-            16: self.channel_mapping.ORGAN_CHANNEL,     # Organ
-            0: self.channel_mapping.PIANO_CHANNEL       # Piano
-        }
-        
-        return program_map.get(instrument.program)
+        return self._program_channels.get(instrument.program)
     
     def _analyze_cross_instrument_interactions(self, result: ProcessingResult):
         """Analyze interactions between instruments."""
@@ -776,7 +904,7 @@ class UnifiedProcessingPipeline:
         for stem_path in result.stems.values():
             try:
                 Path(stem_path).unlink()
-                logger.info(f"Deleted audio stem: {stem_path}")
+                logger.debug("Deleted audio stem: %s", stem_path)
             except Exception as e:
                 logger.warning(f"Failed to delete stem {stem_path}: {str(e)}")
         
@@ -0,0 +1,295 @@
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from rootzengine.processing import batch
+from rootzengine.processing.batch import BatchProcessor, FileProcessor, JobStatus
+
+
+class CountingAnalyzer:
+    """Analyzer stub that records every file it analyzes"""
+
+    def __init__(self):
+        self.calls = []
+
+    def analyze_structure(self, audio_path, perform_separation=False):
+        self.calls.append(audio_path)
+        return {"tempo": np.float32(90.0), "beats": np.arange(3), "sections": {1: "intro"}}
+
+
+class FlakyAnalyzer(CountingAnalyzer):
+    """Analyzer stub that fails on files with "bad" in their name"""
+
+    def analyze_structure(self, audio_path, perform_separation=False):
+        self.calls.append(audio_path)
+        if "bad" in Path(audio_path).name:
+            raise RuntimeError("cannot analyze")
+        return {"file": Path(audio_path).name}
+
+
+class RecordingStorage:
+    """Storage stub that keeps saved results in memory"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.saved = {}
+
+    def save_analysis_result(self, audio_filename, analysis_data):
+        time.sleep(self.delay)
+        self.saved[audio_filename] = analysis_data
+        return audio_filename
+
+
+def _thread_processor(analyzer, storage=None):
+    processor = BatchProcessor(max_workers=2, backend="thread")
+    processor.analyzer = analyzer
+    processor.storage = storage or RecordingStorage()
+    return processor
+
+
+def _write_audio(path, content=b"audio"):
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_cache_hit_skips_analysis(tmp_path):
+    """Test identical content under another name is served from the cache"""
+    analyzer = CountingAnalyzer()
+    first = _write_audio(tmp_path / "a.wav")
+    second = _write_audio(tmp_path / "b.wav")
+    cache_dir = str(tmp_path / "cache")
+
+    missed = batch._analyze_file(analyzer, first, cache_dir)
+    hit = batch._analyze_file(analyzer, second, cache_dir)
+
+    assert analyzer.calls == [first]
+    assert hit == missed == {"tempo": 90.0, "beats": [0, 1, 2], "sections": {"1": "intro"}}
+
+
+def test_no_cache_returns_analyzer_result_unchanged(tmp_path):
+    """Test results are passed through untouched when caching is off"""
+    class FixedAnalyzer:
+        def __init__(self):
+            self.result = {"beats": np.arange(3), 1: "intro"}
+
+        def analyze_structure(self, audio_path, perform_separation=False):
+            return self.result
+
+    analyzer = FixedAnalyzer()
+    result = batch._analyze_file(analyzer, _write_audio(tmp_path / "a.wav"))
+
+    assert result is analyzer.result
+    assert isinstance(result["beats"], np.ndarray)
+
+
+def test_cache_miss_matches_hit_for_float32(tmp_path):
+    """Test a float32 value reads back from the cache exactly as it was returned"""
+    class Float32Analyzer:
+        def analyze_structure(self, audio_path, perform_separation=False):
+            return {"confidence": np.float32(0.1), "curve": np.array([0.1, 0.7], dtype=np.float32)}
+
+    audio = _write_audio(tmp_path / "a.wav")
+    cache_dir = str(tmp_path / "cache")
+    missed = batch._analyze_file(Float32Analyzer(), audio, cache_dir)
+    hit = batch._analyze_file(Float32Analyzer(), audio, cache_dir)
+
+    assert hit == missed
+
+
+def test_cache_force_reanalyzes(tmp_path):
+    """Test force bypasses an existing cache entry"""
+    analyzer = CountingAnalyzer()
+    audio = _write_audio(tmp_path / "a.wav")
+    cache_dir = str(tmp_path / "cache")
+
+    batch._analyze_file(analyzer, audio, cache_dir)
+    batch._analyze_file(analyzer, audio, cache_dir, force=True)
+
+    assert analyzer.calls == [audio, audio]
+
+
+def test_cache_without_orjson(tmp_path, monkeypatch):
+    """Test the json fallback caches results holding numpy values"""
+    monkeypatch.setattr(batch, "ORJSON_AVAILABLE", False)
+    analyzer = CountingAnalyzer()
+    audio = _write_audio(tmp_path / "a.wav")
+    cache_dir = str(tmp_path / "cache")
+
+    missed = batch._analyze_file(analyzer, audio, cache_dir)
+    hit = batch._analyze_file(analyzer, audio, cache_dir)
+
+    assert analyzer.calls == [audio]
+    assert hit == missed == {"tempo": 90.0, "beats": [0, 1, 2], "sections": {"1": "intro"}}
+
+
+def test_unserializable_result_is_not_cached(tmp_path):
+    """Test a result that cannot be cached is still returned"""
+    class OddAnalyzer:
+        def analyze_structure(self, audio_path, perform_separation=False):
+            return {"marker": object()}
+
+    audio = _write_audio(tmp_path / "a.wav")
+    result = batch._analyze_file(OddAnalyzer(), audio, str(tmp_path / "cache"))
+
+    assert "marker" in result
+    assert not list((tmp_path / "cache").glob("*.json"))
+
+
+def test_clear_cache(tmp_path):
+    """Test clear_cache removes every cached result"""
+    cache_dir = tmp_path / "cache"
+    analyzer = CountingAnalyzer()
+    batch._analyze_file(analyzer, _write_audio(tmp_path / "a.wav", b"one"), str(cache_dir))
+    batch._analyze_file(analyzer, _write_audio(tmp_path / "b.wav", b"two"), str(cache_dir))
+
+    with BatchProcessor(backend="thread", cache_dir=str(cache_dir)) as processor:
+        assert processor.clear_cache() == 2
+        assert processor.clear_cache() == 0
+    assert not list(cache_dir.glob("*.json"))
+
+
+def test_scan_directory_follows_supported_extensions(tmp_path):
+    """Test scanning follows reassigned supported_extensions"""
+    (tmp_path / "nested").mkdir()
+    wav = _write_audio(tmp_path / "a.WAV")
+    aiff = _write_audio(tmp_path / "nested" / "b.aiff")
+    _write_audio(tmp_path / "notes.txt")
+
+    with FileProcessor(backend="thread") as processor:
+        assert processor.scan_directory(str(tmp_path)) == [wav]
+        processor.supported_extensions = [*processor.supported_extensions, ".aiff"]
+        assert sorted(processor.scan_directory(str(tmp_path))) == sorted([wav, aiff])
+        processor.supported_extensions = [".aiff"]
+        assert processor.scan_directory(str(tmp_path), recursive=False) == []
+        with pytest.raises(AttributeError):
+            processor.supported_extensions.append(".wav")
+
+
+def test_mixed_batch_status_counts(tmp_path):
+    """Test stats count completed and failed jobs after a mixed batch"""
+    files = [_write_audio(tmp_path / name) for name in ("a.wav", "bad.wav", "b.wav")]
+    storage = RecordingStorage()
+
+    with _thread_processor(FlakyAnalyzer(), storage) as processor:
+        job_ids = processor.add_jobs(files)
+        results = processor.process_batch()
+
+        assert set(results) == set(job_ids)
+        assert processor.get_stats() == {
+            "total": 3, "pending": 0, "running": 0, "completed": 2, "failed": 1
+        }
+        assert sorted(storage.saved) == ["a.wav", "b.wav"]
+        failed = [job for job in results.values() if job.status == JobStatus.FAILED]
+        assert [job.file_path for job in failed] == [files[1]]
+        assert "cannot analyze" in failed[0].error
+
+
+def test_missing_files_fail_without_submission(tmp_path):
+    """Test missing files are failed up front and never analyzed"""
+    present = _write_audio(tmp_path / "a.wav")
+    missing = str(tmp_path / "missing.wav")
+    analyzer = CountingAnalyzer()
+
+    with _thread_processor(analyzer) as processor:
+        missing_id, present_id = processor.add_jobs([missing, present])
+        results = processor.process_batch()
+
+        assert analyzer.calls == [present]
+        assert results[missing_id].status == JobStatus.FAILED
+        assert "File not found" in results[missing_id].error
+        assert results[present_id].status == JobStatus.COMPLETED
+
+
+def test_clear_completed_jobs_keeps_index_consistent(tmp_path):
+    """Test clearing finished jobs leaves pending jobs and stats in sync"""
+    files = [_write_audio(tmp_path / name) for name in ("a.wav", "bad.wav")]
+
+    with _thread_processor(FlakyAnalyzer()) as processor:
+        processor.add_jobs(files)
+        processor.process_batch()
+        pending_id = processor.add_job(_write_audio(tmp_path / "c.wav"))
+
+        assert processor.clear_completed_jobs() == 2
+        assert list(processor.jobs) == [pending_id]
+        assert [job.id for job in processor.get_pending_jobs()] == [pending_id]
+        assert processor.get_stats() == {
+            "total": 1, "pending": 1, "running": 0, "completed": 0, "failed": 0
+        }
+        assert processor.clear_completed_jobs() == 0
+
+        processor.process_batch()
+        assert processor.get_stats()["completed"] == 1
+
+
+def test_close_flushes_writer_queue(tmp_path):
+    """Test close() waits for queued results to be saved"""
+    storage = RecordingStorage(delay=0.05)
+    processor = _thread_processor(CountingAnalyzer(), storage)
+    jobs = [processor.jobs[job_id] for job_id in processor.add_jobs(
+        [_write_audio(tmp_path / name) for name in ("a.wav", "b.wav", "c.wav")]
+    )]
+    for job in jobs:
+        processor._start_job(job)
+        processor._queue_save(job, {"file": job.file_path})
+
+    processor.close()
+
+    assert sorted(storage.saved) == ["a.wav", "b.wav", "c.wav"]
+    assert all(job.status == JobStatus.COMPLETED for job in jobs)
+    assert processor._writer is None
+
+
+def test_stats_consistent_while_saving(tmp_path):
+    """Test get_stats() can be polled while the writer is still saving results"""
+    files = [_write_audio(tmp_path / f"{i}.wav") for i in range(20)]
+    storage = RecordingStorage(delay=0.005)
+
+    with _thread_processor(CountingAnalyzer(), storage) as processor:
+        processor.add_jobs(files)
+        worker = threading.Thread(target=processor.process_batch)
+        worker.start()
+
+        snapshots = []
+        while worker.is_alive():
+            snapshots.append(processor.get_stats())
+            processor.get_pending_jobs()
+            processor.results_columns()
+        worker.join()
+
+        assert snapshots
+        for stats in snapshots:
+            assert stats["pending"] + stats["running"] + stats["completed"] + stats["failed"] == 20
+        completed = [stats["completed"] for stats in snapshots]
+        assert completed == sorted(completed)
+        assert processor.get_stats()["completed"] == 20
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_small_batch_on_each_backend(tmp_path, backend):
+    """Test a small batch completes on both worker backends"""
+    files = [_write_audio(tmp_path / name, name.encode()) for name in ("a.wav", "bad.wav", "b.wav")]
+    storage = RecordingStorage()
+
+    with BatchProcessor(max_workers=2, backend=backend) as processor:
+        processor.analyzer = FlakyAnalyzer()
+        processor.storage = storage
+        processor.add_jobs(files)
+        results = processor.process_batch()
+
+        assert len(results) == 3
+        assert processor.get_stats()["completed"] == 2
+        assert processor.get_stats()["failed"] == 1
+        assert storage.saved == {"a.wav": {"file": "a.wav"}, "b.wav": {"file": "b.wav"}}
+
+
+def test_unknown_backend_rejected():
+    """Test an unknown backend name fails at construction"""
+    with pytest.raises(ValueError):
+        BatchProcessor(backend="fiber")
@@ -0,0 +1,51 @@
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from rootzengine.ml.dataset import AudioDataset
+
+
+def _write_dataset(path, n_samples=10, n_features=3):
+    features = np.arange(n_samples * n_features, dtype=np.float32).reshape(n_samples, n_features)
+    np.save(path / "features.npy", features)
+    np.save(path / "labels.npy", np.arange(n_samples))
+    return features
+
+
+def test_get_batch_before_load_is_empty(tmp_path):
+    """Test get_batch returns empty arrays when no data is loaded"""
+    dataset = AudioDataset(str(tmp_path))
+    samples, labels = dataset.get_batch(4)
+    assert samples.size == 0
+    assert labels.size == 0
+
+
+def test_epoch_covers_every_sample_once(tmp_path):
+    """Test one epoch of batches visits each sample exactly once"""
+    features = _write_dataset(tmp_path)
+    dataset = AudioDataset(str(tmp_path), seed=0)
+    dataset.load_data()
+    assert len(dataset) == 10
+
+    seen = []
+    for expected_size in (4, 4, 2):
+        samples, labels = dataset.get_batch(4)
+        assert len(samples) == expected_size
+        np.testing.assert_array_equal(samples, features[labels])
+        seen.extend(labels.tolist())
+
+    assert sorted(seen) == list(range(10))
+
+
+def test_load_data_rejects_mismatched_labels(tmp_path):
+    """Test load_data fails when features and labels disagree in length"""
+    _write_dataset(tmp_path)
+    np.save(tmp_path / "labels.npy", np.arange(3))
+    dataset = AudioDataset(str(tmp_path))
+    with pytest.raises(ValueError):
+        dataset.load_data()
@@ -0,0 +1,183 @@
+import pytest
+import sys
+from pathlib import Path
+
+import pretty_midi
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from rootzengine.midi.converter import AudioToMIDIConverter
+from rootzengine.midi.patterns import MIDIPattern, MIDIPatternGenerator, RiddimType
+
+
+def test_generate_pattern_instruments():
+    """Test generate_pattern returns one drum and one bass instrument"""
+    generator = MIDIPatternGenerator(tempo=80.0)
+    midi = generator.generate_pattern(pattern_type="one_drop", key="A", mode="minor", measures=2)
+
+    assert len(midi.instruments) == 2
+    drums, bass = midi.instruments
+    assert drums.is_drum
+    assert not bass.is_drum
+    assert all(note.start < 2 * 4 * generator.beat_duration for note in drums.notes)
+
+
+def test_one_drop_kick_on_beat_three():
+    """Test the one drop places its only kick on beat 3"""
+    generator = MIDIPatternGenerator(tempo=60.0)
+    midi = generator.generate_pattern(pattern_type="one_drop", measures=1)
+
+    kicks = [note.start for note in midi.instruments[0].notes if note.pitch == 36]
+    assert kicks == [pytest.approx(2.0)]
+
+
+def test_generate_pattern_notes_in_time_order():
+    """Test every riddim comes out sorted by start time and pitch"""
+    generator = MIDIPatternGenerator(tempo=100.0)
+    for pattern_type in ("one_drop", "steppers", "rockers"):
+        midi = generator.generate_pattern(pattern_type=pattern_type, bass_style="complex", measures=3)
+        for instrument in midi.instruments:
+            keys = [(note.start, note.pitch) for note in instrument.notes]
+            assert keys == sorted(keys)
+
+
+def test_converter_offsets_sections():
+    """Test sections are placed at their start times and kept in order"""
+    analysis = {
+        "tempo": {"bpm": 60.0},
+        "key": {"root": "C", "mode": "major"},
+        "sections": [
+            {"start": 0.0, "end": 8.0, "label": "intro"},
+            {"start": 8.0, "end": 16.0, "label": "verse"},
+            {"start": 16.0, "end": 16.5, "label": "break"},
+        ],
+    }
+    midi = AudioToMIDIConverter(analysis).generate()
+
+    drums, bass = midi.instruments
+    starts = [note.start for note in bass.notes]
+    assert starts == sorted(starts)
+    assert starts[0] == pytest.approx(0.0)
+    assert any(start >= 8.0 for start in starts)
+    assert max(note.end for note in drums.notes) <= 16.0 + 1e-6
+
+
+def test_converter_sorts_out_of_order_sections():
+    """Test notes come out in time order even when sections do not"""
+    analysis = {
+        "tempo": {"bpm": 120.0},
+        "sections": [
+            {"start": 8.0, "end": 16.0, "label": "chorus"},
+            {"start": 0.0, "end": 8.0, "label": "verse"},
+        ],
+    }
+    midi = AudioToMIDIConverter(analysis).generate()
+
+    for instrument in midi.instruments:
+        keys = [(note.start, note.pitch) for note in instrument.notes]
+        assert keys == sorted(keys)
+
+
+def test_save_roundtrip(tmp_path):
+    """Test saved MIDI files read back with the same notes"""
+    analysis = {
+        "tempo": {"bpm": 90.0},
+        "key": {"root": "G", "mode": "minor"},
+        "sections": [{"start": 0.0, "end": 16.0, "label": "chorus"}],
+    }
+    converter = AudioToMIDIConverter(analysis)
+    midi = converter.generate()
+    output_path = tmp_path / "song.mid"
+    converter.save(midi, str(output_path))
+
+    loaded = pretty_midi.PrettyMIDI(str(output_path))
+    assert loaded.get_tempo_changes()[1][0] == pytest.approx(90.0, rel=1e-3)
+    for original, reloaded in zip(midi.instruments, loaded.instruments):
+        assert reloaded.is_drum == original.is_drum
+        assert len(reloaded.notes) == len(original.notes)
+        original_notes = sorted((n.start, n.pitch) for n in original.notes)
+        reloaded_notes = sorted((n.start, n.pitch) for n in reloaded.notes)
+        for (s1, p1), (s2, p2) in zip(original_notes, reloaded_notes):
+            assert p1 == p2
+            assert s1 == pytest.approx(s2, abs=1e-2)
+
+
+def test_generate_pattern_writes_cached_file(tmp_path):
+    """Test repeated patterns write identical, readable files"""
+    generator = MIDIPatternGenerator(tempo=100.0)
+    first_path = tmp_path / "a" / "first.mid"
+    second_path = tmp_path / "b" / "second.mid"
+    midi = generator.generate_pattern(pattern_type="steppers", measures=2, output_path=str(first_path))
+    generator.generate_pattern(pattern_type="steppers", measures=2, output_path=str(second_path))
+
+    assert first_path.read_bytes() == second_path.read_bytes()
+    loaded = pretty_midi.PrettyMIDI(str(second_path))
+    assert [len(i.notes) for i in loaded.instruments] == [len(i.notes) for i in midi.instruments]
+
+
+def test_generate_pattern_recreates_deleted_directory(tmp_path):
+    """Test writing into an output directory that was removed after first use"""
+    generator = MIDIPatternGenerator(tempo=100.0)
+    output_path = tmp_path / "out" / "pattern.mid"
+    generator.generate_pattern(measures=1, output_path=str(output_path))
+    output_path.unlink()
+    output_path.parent.rmdir()
+
+    MIDIPatternGenerator(tempo=100.0).generate_pattern(measures=1, output_path=str(output_path))
+    assert output_path.exists()
+
+
+def test_generate_pattern_accepts_riddim_type():
+    """Test the deprecated RiddimType form still returns a library pattern"""
+    generator = MIDIPatternGenerator()
+    with pytest.warns(DeprecationWarning):
+        pattern = generator.generate_pattern(RiddimType.ONE_DROP)
+    with pytest.warns(DeprecationWarning):
+        empty = generator.generate_pattern(riddim_type=RiddimType.DANCEHALL)
+
+    assert isinstance(pattern, MIDIPattern)
+    assert pattern == generator.riddim_pattern(RiddimType.ONE_DROP)
+    assert empty.notes == []
+
+
+def test_generate_pattern_notes_returns_independent_copies():
+    """Test callers can shift returned buffers without affecting later patterns"""
+    generator = MIDIPatternGenerator(tempo=120.0)
+    drums, _ = generator.generate_pattern_notes(measures=1)
+    first_start = float(drums.starts[0])
+    drums.offset(10.0)
+
+    again, _ = generator.generate_pattern_notes(measures=1)
+    assert float(again.starts[0]) == first_start
+    midi = generator.generate_pattern(measures=1)
+    assert midi.instruments[0].notes[0].start == pytest.approx(first_start)
+
+
+def test_save_keeps_zero_length_notes_closed(tmp_path):
+    """Test notes shorter than a tick are written as one-tick notes"""
+    midi = pretty_midi.PrettyMIDI(initial_tempo=120.0)
+    bass = pretty_midi.Instrument(program=33, name="Bass")
+    bass.notes = [
+        pretty_midi.Note(100, 40, 1.0, 1.0001),
+        pretty_midi.Note(100, 40, 2.0, 2.5),
+    ]
+    midi.instruments.append(bass)
+    output_path = tmp_path / "short.mid"
+    AudioToMIDIConverter({"tempo": {"bpm": 120.0}}).save(midi, str(output_path))
+
+    notes = pretty_midi.PrettyMIDI(str(output_path)).instruments[0].notes
+    assert len(notes) == 2
+    assert notes[0].start == pytest.approx(1.0, abs=1e-3)
+    assert 0 < notes[0].end - notes[0].start < 0.01
+    assert notes[1].end == pytest.approx(2.5, abs=1e-3)
+
+
+def test_save_uses_the_midi_tempo(tmp_path):
+    """Test save writes the tempo of the MIDI it is given"""
+    midi = AudioToMIDIConverter({"tempo": {"bpm": 75.0}}).generate()
+    output_path = tmp_path / "tempo.mid"
+    AudioToMIDIConverter({"tempo": {"bpm": 140.0}}).save(midi, str(output_path))
+
+    loaded = pretty_midi.PrettyMIDI(str(output_path))
+    assert loaded.get_tempo_changes()[1][0] == pytest.approx(75.0, rel=1e-3)
@@ -0,0 +1,38 @@
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from rootzengine.ml.models import ReggaeClassifier
+
+
+def test_predict_requires_training():
+    """Test predictions fail before the classifier is fitted"""
+    classifier = ReggaeClassifier()
+    with pytest.raises(ValueError):
+        classifier.predict(np.zeros((2, 3)))
+    with pytest.raises(ValueError):
+        classifier.predict_proba(np.zeros((2, 3)))
+
+
+def test_fit_separates_classes():
+    """Test a fitted classifier labels well-separated clusters correctly"""
+    rng = np.random.default_rng(0)
+    X = np.vstack([
+        rng.normal(loc=(0, 100), scale=1.0, size=(50, 2)),
+        rng.normal(loc=(10, 100), scale=1.0, size=(50, 2)),
+    ])
+    y = np.array(["roots"] * 50 + ["dub"] * 50)
+
+    classifier = ReggaeClassifier()
+    classifier.fit(X, y)
+
+    assert (classifier.predict(X) == y).mean() > 0.95
+    proba = classifier.predict_proba(X)
+    assert proba.shape == (100, 2)
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0, rtol=1e-5)
+    np.testing.assert_array_equal(classifier.classes_[proba.argmax(axis=1)], classifier.predict(X))